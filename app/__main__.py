@@ -1,19 +1,43 @@
 import uvicorn
+from gunicorn.app.base import BaseApplication
 
-from config.settings import settings
+from app.config.settings import settings
+
+
+class GunicornServer(BaseApplication):
+    """Gunicorn embutido, configurado por app.config.gunicorn_conf."""
+
+    def load_config(self):
+        from app.config import gunicorn_conf
+
+        for key, value in vars(gunicorn_conf).items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        from app.application import get_app
+
+        return get_app()
 
 
 def main() -> None:
     """
         Main function.
+
+        Com reload ativo roda um único processo uvicorn (desenvolvimento);
+        caso contrário sobe o gunicorn com vários workers uvicorn.
     """
-    uvicorn.run(
-        "app.application:get_app",
-        host=settings.host,
-        port=settings.fastapi_port,
-        reload=settings.reload,
-        factory=True
-    )
+    if settings.reload:
+        uvicorn.run(
+            "app.application:get_app",
+            host=settings.host,
+            port=settings.fastapi_port,
+            reload=settings.reload,
+            factory=True
+        )
+        return
+
+    GunicornServer().run()
 
 
 if __name__ == "__main__":
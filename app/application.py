@@ -1,18 +1,17 @@
-import logging
-
 from fastapi import FastAPI
 from app.config.settings import settings
-from app.config.lifetime import startup, shutdown
+from app.config.lifetime import lifespan
 from app.config.connection import on_application_startup, on_application_shutdown
 from app.views.members import router as members
 from app.views.oauth import router as oauth
-from app.utils.logger import setup_logger
-from app.utils.middleware import LoggingMiddleware
+from app.views.well_known import router as well_known
+from app.views.metrics import router as metrics
+from app.views.health import router as health
+from app.utils.middleware import LoggingMiddleware, MetricsMiddleware
 
-setup_logger()
-LOGGER = logging.getLogger(__name__)
 
 def get_app() -> FastAPI:
+    # Sem efeitos colaterais até o lifespan: montar o app só registra rotas e middlewares
     app = FastAPI(
         title="Api Scammer",
         description="Api para pegar dados via web com suporte OAuth 2.0",
@@ -21,12 +20,15 @@ def get_app() -> FastAPI:
         debug=settings.debug,
         docs_url=None,
         redoc_url=None,
+        lifespan=lifespan(on_application_startup, on_application_shutdown),
     )
-    LOGGER.info("Iniciando aplicação...")
-    app.on_event("startup")(startup(on_application_startup))
-    app.on_event("shutdown")(shutdown(on_application_shutdown))
     app.add_middleware(LoggingMiddleware)
     app.include_router(members)
     app.include_router(oauth)
+    app.include_router(well_known)
+    app.include_router(health)
+    if settings.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(metrics)
     return app
 
@@ -1,20 +1,33 @@
-from datetime import datetime, timedelta
-from typing import Optional, Dict, List
-from jose import JWTError, jwt
+import time
+import uuid
+from datetime import timedelta
+from functools import cached_property
+from typing import Optional, Dict, List, Tuple
+from jose import ExpiredSignatureError, JWTError
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
+from app.auth import tokens
+from app.auth.hashing import password_policy
+from app.auth.keys import KeyManager, get_key_manager
 from app.config.settings import settings
 from app.schemas.oauth_schema import TokenData
 
 
 class AuthHandler:
     def __init__(self):
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-        self.secret_key = settings.secret_key
         self.algorithm = settings.algorithm
         self.access_token_expire_minutes = settings.access_token_expire_minutes
         self.refresh_token_expire_days = 30  # Default refresh token validity in days
 
+    # Construídos no primeiro uso: importar o módulo não lê chaves nem monta o CryptContext
+    @cached_property
+    def pwd_context(self) -> CryptContext:
+        return CryptContext(**password_policy())
+
+    @cached_property
+    def key_manager(self) -> KeyManager:
+        return get_key_manager()
+
     def verify_password(self, plain_password, hashed_password):
         return self.pwd_context.verify(plain_password, hashed_password)
 
@@ -22,66 +35,94 @@ class AuthHandler:
         return self.pwd_context.hash(password)
 
     def create_access_token(self, data: Dict, expires_delta: Optional[timedelta] = None, scopes: List[str] = None) -> str:
-        to_encode = data.copy()
-
-        if expires_delta:
-            expire = datetime.utcnow() + expires_delta
-        else:
-            expire = datetime.utcnow() + timedelta(minutes=self.access_token_expire_minutes)
-
+        now = time.time()
+        return tokens.encode(self._access_claims(data, now, expires_delta, scopes), self.key_manager.active)
+
+    def create_refresh_token(self, data: Dict, family_id: Optional[str] = None, scopes: List[str] = None) -> str:
+        """Cria um refresh token com jti próprio; ``family_id`` liga os tokens de uma mesma rotação."""
+        now = time.time()
+        return tokens.encode(self._refresh_claims(data, now, family_id, scopes), self.key_manager.active)
+
+    def create_token_pair(self, data: Dict, expires_delta: Optional[timedelta] = None, scopes: List[str] = None,
+                          family_id: Optional[str] = None) -> Tuple[str, str]:
+        """Access e refresh token do login, com o mesmo instante e os claims comuns serializados uma vez.
+
+        Saída idêntica a ``create_access_token`` + ``create_refresh_token``.
+        """
+        now = time.time()
+        key = self.key_manager.active
+        access = self._access_claims({}, now, expires_delta, scopes)
+        refresh = self._refresh_claims({}, now, family_id, scopes)
+        template = tokens.ClaimsTemplate(data)
+        if not (template.compatible(access) and template.compatible(refresh)):
+            return (tokens.encode({**data, **access}, key), tokens.encode({**data, **refresh}, key))
+        return tokens.sign(template.render(access), key), tokens.sign(template.render(refresh), key)
+
+    def _access_claims(self, data: Dict, now: float, expires_delta: Optional[timedelta], scopes: List[str]) -> Dict:
+        # Mesma ordem de claims e mesmo arredondamento (segundos inteiros) dos tokens já emitidos
+        ttl = expires_delta.total_seconds() if expires_delta else self.access_token_expire_minutes * 60
+        claims = {**data, "scopes": scopes} if scopes else {**data}
+        claims["exp"] = int(now + ttl)
+        claims["iat"] = int(now)
+        claims["token_type"] = "access_token"
+        return claims
+
+    def _refresh_claims(self, data: Dict, now: float, family_id: Optional[str], scopes: List[str] = None) -> Dict:
+        jti = uuid.uuid4().hex
+        claims = {
+            **data,
+            "exp": int(now + self.refresh_token_expire_days * 86400),
+            "iat": int(now),
+            "token_type": "refresh_token",
+            "jti": jti,
+            "fid": family_id or jti,
+        }
+        # Escopos concedidos no login, para que o refresh não os amplie
         if scopes:
-            to_encode.update({"scopes": scopes})
-
-        to_encode.update({"exp": expire})
-        to_encode.update({"iat": datetime.utcnow()})  # Issued at time
-        to_encode.update({"token_type": "access_token"})
-
-        encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
-        return encoded_jwt
-
-    def create_refresh_token(self, data: Dict) -> str:
-        to_encode = data.copy()
-        expire = datetime.utcnow() + timedelta(days=self.refresh_token_expire_days)
-        to_encode.update({"exp": expire})
-        to_encode.update({"iat": datetime.utcnow()})  # Issued at time
-        to_encode.update({"token_type": "refresh_token"})  # Identify token type
-
-        encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
-        return encoded_jwt
+            claims["scopes"] = scopes
+        return claims
 
-    def decode_token(self, token: str) -> TokenData:
+    def decode_token(self, token: str, expected_type: Optional[str] = None) -> TokenData:
+        """Verifica o token uma única vez e devolve seus claims como TokenData."""
         credentials_exception = HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-
-            # Verificar se o token não está expirado
-            expiration = payload.get("exp")
-            if expiration and datetime.utcfromtimestamp(expiration) < datetime.utcnow():
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Token expirado",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
-
-            # Extrair informações do token
-            username: str = payload.get("sub")
-            if username is None:
-                raise credentials_exception
-
-            token_data = TokenData(
-                sub=username,
-                name=payload.get("name"),
-                key=payload.get("key"),
-                privilege=payload.get("privilege"),
-                scopes=payload.get("scopes", [])
+            payload = tokens.decode(token, self.key_manager)
+        except ExpiredSignatureError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token expirado",
+                headers={"WWW-Authenticate": "Bearer"},
             )
-            return token_data
-
         except JWTError:
             raise credentials_exception
 
+        if expected_type is not None and payload.get("token_type") != expected_type:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token inválido",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        # Extrair informações do token
+        username: str = payload.get("sub")
+        if username is None:
+            raise credentials_exception
+
+        token_data = TokenData(
+            sub=username,
+            name=payload.get("name"),
+            key=payload.get("key"),
+            privilege=payload.get("privilege"),
+            scopes=payload.get("scopes", []),
+            token_type=payload.get("token_type"),
+            exp=payload.get("exp"),
+            jti=payload.get("jti"),
+            fid=payload.get("fid"),
+        )
+        return token_data
+
 auth_handler = AuthHandler()
@@ -0,0 +1,184 @@
+import asyncio
+import datetime
+import hashlib
+import hmac
+import logging
+import time
+from typing import Dict, Optional
+
+from app.config.settings import settings
+from app.models.member_models import MemberAuthRecord
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ClientRecord:
+    __slots__ = ("client_id", "secret_digest", "name", "privilege_level", "disabled")
+
+    def __init__(self, client_id, secret_digest, name, privilege_level, disabled):
+        self.client_id = client_id
+        self.secret_digest = secret_digest
+        self.name = name
+        self.privilege_level = privilege_level
+        self.disabled = disabled
+
+
+class ClientRegistry:
+    """In-memory index of client_credentials clients.
+
+    Secrets are kept only as HMAC-SHA256 digests and compared in constant
+    time. Every member can authenticate as a client, so the index is not
+    loaded from the member table: it holds only the clients that did
+    authenticate (added by ``upsert`` after a database lookup), at most
+    ``max_size`` of them, the least recently added evicted first. Polling
+    re-reads just those ids, in pages of ``SYNC_PAGE``: members whose
+    ``updated_at`` is newer than the previous poll, and every
+    ``full_sync_interval`` all of them, which drops deleted members. The poll
+    watermark is the clock at the start of each sync (minus a margin for
+    clock skew), not a document field. Writes in this process call
+    ``remove`` directly. When disabled, ``get`` always misses and ``upsert``
+    builds records without storing them.
+    """
+
+    # Margem para relógios do app e do Mongo fora de sincronia; recarrega alguns documentos a mais
+    SYNC_OVERLAP = datetime.timedelta(seconds=5)
+    SYNC_PAGE = 1000
+
+    def __init__(
+            self,
+            key: str,
+            refresh_interval: float,
+            full_sync_interval: float = 300.0,
+            max_size: int = 10000,
+            enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self.max_size = max_size
+        self._key = key.encode("utf-8")
+        self.refresh_interval = refresh_interval
+        self.full_sync_interval = full_sync_interval
+        self._clients: Dict[str, ClientRecord] = {}
+        self._last_sync: Optional[datetime.datetime] = None
+        self._next_full_sync = 0.0
+        # Removidos enquanto uma sincronização está em andamento: o resultado dela pode estar velho
+        self._removed_during_sync: Optional[set] = None
+        self._task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._clients)
+
+    def digest(self, client_secret: str) -> bytes:
+        return hmac.new(self._key, client_secret.encode("utf-8"), hashlib.sha256).digest()
+
+    def verify(self, record: ClientRecord, client_secret: str) -> bool:
+        return hmac.compare_digest(record.secret_digest, self.digest(client_secret))
+
+    def get(self, client_id: str) -> Optional[ClientRecord]:
+        record = self._clients.get(client_id)
+        if record is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return record
+
+    def upsert(self, member: MemberAuthRecord) -> Optional[ClientRecord]:
+        client_id = member.email
+        client_secret = member.key_member
+        if not client_id or not client_secret:
+            return None
+
+        record = ClientRecord(
+            client_id=client_id,
+            secret_digest=self.digest(client_secret),
+            name=member.name,
+            privilege_level=member.privilege_level,
+            disabled=member.disabled,
+        )
+        if self.enabled:
+            self._clients.pop(client_id, None)
+            if len(self._clients) >= self.max_size:
+                # Dicts mantêm a ordem de inserção: o primeiro é o cliente adicionado há mais tempo
+                del self._clients[next(iter(self._clients))]
+            self._clients[client_id] = record
+        return record
+
+    def remove(self, client_id: str):
+        self._clients.pop(client_id, None)
+        if self._removed_during_sync is not None:
+            self._removed_during_sync.add(client_id)
+
+    async def refresh(self, repository, full: Optional[bool] = None):
+        """Sincroniza os clientes conhecidos: só os alterados desde a última sincronização, ou todos quando vence o intervalo."""
+        if full is None:
+            full = self._last_sync is None or time.monotonic() >= self._next_full_sync
+        started = datetime.datetime.utcnow()
+        known = list(self._clients)
+        self._removed_during_sync = set()
+        try:
+            members = []
+            for start in range(0, len(known), self.SYNC_PAGE):
+                members.extend(await repository.list_clients(
+                    None if full else self._last_sync, emails=known[start:start + self.SYNC_PAGE]
+                ))
+            removed = self._removed_during_sync
+        finally:
+            self._removed_during_sync = None
+
+        records = [MemberAuthRecord.from_document(member) for member in members]
+        if full:
+            # Conhecidos que não voltaram foram apagados
+            found = {record.email for record in records}
+            for client_id in known:
+                if client_id not in found:
+                    self._clients.pop(client_id, None)
+            self._next_full_sync = time.monotonic() + self.full_sync_interval
+        for record in records:
+            if record.email not in removed and record.email in self._clients:
+                self._refresh_record(record)
+        self._last_sync = started - self.SYNC_OVERLAP
+        return len(members)
+
+    def _refresh_record(self, member: MemberAuthRecord):
+        # Atualiza no lugar: a sincronização não conta como uso recente para a ordem de descarte
+        record = self._clients[member.email]
+        if member.key_member:
+            record.secret_digest = self.digest(member.key_member)
+        else:
+            del self._clients[member.email]
+            return
+        record.name = member.name
+        record.privilege_level = member.privilege_level
+        record.disabled = member.disabled
+
+    async def start(self, repository):
+        if not self.enabled:
+            return
+        self._task = asyncio.create_task(self._poll(repository))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _poll(self, repository):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh(repository)
+            except Exception as e:
+                LOGGER.warning(f'Falha ao atualizar o registro de clientes: {e}')
+
+
+client_registry = ClientRegistry(
+    key=settings.secret_key,
+    refresh_interval=settings.client_registry_refresh_seconds,
+    full_sync_interval=settings.client_registry_full_sync_seconds,
+    max_size=settings.client_registry_max_size,
+    enabled=settings.client_registry_enabled,
+)
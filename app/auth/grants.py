@@ -0,0 +1,115 @@
+from typing import Awaitable, Callable, Dict, List, Optional
+from urllib.parse import unquote_plus
+
+from fastapi import HTTPException, Request, status
+
+from app.config.settings import settings
+
+FORM_CONTENT_TYPE = "application/x-www-form-urlencoded"
+
+# grant_type -> handler(controller, parâmetros do corpo)
+GrantHandler = Callable[[object, Dict[str, str]], Awaitable[object]]
+GRANT_HANDLERS: Dict[str, GrantHandler] = {}
+
+
+def grant_handler(grant_type: str):
+    """Registra o handler de um grant type no endpoint /oauth/token."""
+    def register(handler: GrantHandler) -> GrantHandler:
+        GRANT_HANDLERS[grant_type] = handler
+        return handler
+    return register
+
+
+class PasswordGrant:
+    """Parameters of the ``password`` grant, with the attributes of ``OAuth2PasswordRequestForm``."""
+
+    __slots__ = ("grant_type", "username", "password", "scopes", "client_id", "client_secret")
+
+    def __init__(self, params: Dict[str, str]):
+        self.grant_type = "password"
+        self.username = params.get("username", "")
+        self.password = params.get("password", "")
+        self.scopes: List[str] = params.get("scope", "").split()
+        self.client_id = params.get("client_id")
+        self.client_secret = params.get("client_secret")
+
+
+class ClientCredentialsGrant:
+    """Parameters of the ``client_credentials`` grant."""
+
+    __slots__ = ("grant_type", "scope", "client_id", "client_secret")
+
+    def __init__(self, params: Dict[str, str]):
+        self.grant_type = "client_credentials"
+        self.scope = params.get("scope", "")
+        self.client_id = params.get("client_id")
+        self.client_secret = params.get("client_secret")
+
+
+def parse_urlencoded(body: bytes) -> Dict[str, str]:
+    """Decode an ``application/x-www-form-urlencoded`` body.
+
+    Parameters without a value become empty strings, and only pairs that
+    contain ``%`` or ``+`` go through ``unquote_plus``. RFC 6749 forbids
+    repeating a parameter, so a repeated one is rejected instead of one
+    value silently winning.
+    """
+    # latin-1, como o FormParser do Starlette: nunca falha e o percent-encoding é decodificado como UTF-8
+    params = {}
+    for pair in body.decode("latin-1").split("&"):
+        if not pair:
+            continue
+        name, _, value = pair.partition("=")
+        if "%" in pair or "+" in pair:
+            name, value = unquote_plus(name), unquote_plus(value)
+        if name in params:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"O parâmetro {name} foi enviado mais de uma vez"
+            )
+        params[name] = value
+    return params
+
+
+async def read_token_request(request: Request, max_bytes: int = settings.oauth_max_body_bytes) -> Dict[str, str]:
+    """Parâmetros do /oauth/token; corpos urlencoded são lidos com limite de tamanho e sem python-multipart."""
+    content_type = request.headers.get("content-type", "")
+    if not content_type.startswith(FORM_CONTENT_TYPE):
+        # multipart/form-data continua aceito pelo caminho do Starlette
+        form = await request.form()
+        return {name: value for name, value in form.items() if isinstance(value, str)}
+
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Corpo da requisição maior que {max_bytes} bytes"
+    )
+    length = request.headers.get("content-length")
+    if length is not None and length.isdigit() and int(length) > max_bytes:
+        raise too_large
+    body = b""
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            raise too_large
+    return parse_urlencoded(body)
+
+
+@grant_handler("password")
+async def password_grant(service, params: Dict[str, str]):
+    return await service.oauth_login(PasswordGrant(params))
+
+
+@grant_handler("refresh_token")
+async def refresh_token_grant(service, params: Dict[str, str]):
+    refresh_token: Optional[str] = params.get("refresh_token")
+    if not refresh_token:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Refresh token é obrigatório para grant_type 'refresh_token'"
+        )
+    return await service.refresh_token(refresh_token)
+
+
+@grant_handler("client_credentials")
+async def client_credentials_grant(service, params: Dict[str, str]):
+    return await service.client_credentials_login(ClientCredentialsGrant(params))
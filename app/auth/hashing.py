@@ -0,0 +1,225 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import cached_property
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+from passlib.hash import argon2
+
+from app.config.settings import settings
+
+LOGGER = logging.getLogger(__name__)
+
+def password_policy(
+        schemes: List[str] = None,
+        bcrypt_rounds: int = None,
+        argon2_memory_cost: int = None,
+        argon2_time_cost: int = None,
+        argon2_parallelism: int = None,
+) -> Dict:
+    """Keyword arguments of the ``CryptContext`` for the configured hashing policy.
+
+    Plain data, so it can be sent to the pool processes. Every scheme after
+    the first is deprecated: it still verifies, but ``needs_update`` flags it,
+    as it does hashes with a different work factor.
+    """
+    schemes = list(schemes or settings.password_schemes)
+    policy = {"schemes": schemes, "deprecated": "auto"}
+    if "bcrypt" in schemes:
+        policy["bcrypt__rounds"] = bcrypt_rounds or settings.bcrypt_rounds
+    if "argon2" in schemes:
+        if not argon2.has_backend():
+            raise RuntimeError("PASSWORD_SCHEMES inclui argon2, mas o pacote argon2-cffi não está instalado")
+        policy.update(
+            argon2__type="ID",
+            argon2__memory_cost=argon2_memory_cost or settings.argon2_memory_cost,
+            argon2__rounds=argon2_time_cost or settings.argon2_time_cost,
+            argon2__parallelism=argon2_parallelism or settings.argon2_parallelism,
+        )
+    return policy
+
+
+# Contexto de cada processo do pool, criado pelo initializer do executor
+_worker_context: Optional[CryptContext] = None
+
+
+def _init_worker(policy: Dict):
+    global _worker_context
+    _worker_context = CryptContext(**policy)
+
+
+def _get_worker_context() -> CryptContext:
+    if _worker_context is None:
+        _init_worker(password_policy())
+    return _worker_context
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return _get_worker_context().verify(plain_password, hashed_password)
+
+
+def _hash(password: str) -> str:
+    return _get_worker_context().hash(password)
+
+
+def _hash_many(passwords: List[str]) -> List[str]:
+    context = _get_worker_context()
+    return [context.hash(password) for password in passwords]
+
+
+class HashingStats:
+    """Per-operation call count and latency accumulated by the hasher."""
+
+    def __init__(self):
+        self.calls = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def observe(self, elapsed: float):
+        self.calls += 1
+        self.total_seconds += elapsed
+        if elapsed > self.max_seconds:
+            self.max_seconds = elapsed
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "avg_ms": (self.total_seconds / self.calls) * 1000 if self.calls else 0.0,
+            "max_ms": self.max_seconds * 1000,
+        }
+
+
+class PasswordHasher:
+    """Runs bcrypt hash/verify in a process pool so the event loop stays free.
+
+    At most ``workers + queue_size`` operations are admitted at once; anything
+    beyond that is rejected with 429 instead of piling up behind the pool.
+    Pool processes are started by a forkserver, never forked from the
+    threaded app process; a pool broken by a dying process (OOM kill,
+    segfault) is replaced and the operation retried once.
+    Bulk hashing (``hash_many``) goes in chunks of ``bulk_chunk_size`` and
+    keeps ``reserved_workers`` processes out of its reach, so logins queued
+    behind an import wait for at most one small chunk, if at all.
+    """
+
+    def __init__(
+            self,
+            workers: int = 0,
+            queue_size: int = 64,
+            policy: Optional[Dict] = None,
+            bulk_chunk_size: int = 4,
+            reserved_workers: int = 1,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.policy = policy or password_policy()
+        self.queue_size = queue_size
+        self.bulk_chunk_size = max(1, bulk_chunk_size)
+        # Com um único processo não há o que reservar; o chunk pequeno é o que limita a espera
+        self._bulk_slots = asyncio.Semaphore(max(1, self.workers - reserved_workers))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots = self.workers + self.queue_size
+        self._in_flight = 0
+        self.stats = {"verify": HashingStats(), "hash": HashingStats()}
+
+    @cached_property
+    def context(self) -> CryptContext:
+        # Só para needs_update, que apenas lê os parâmetros do hash e roda no processo principal
+        return CryptContext(**self.policy)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("forkserver"),
+                initializer=_init_worker,
+                initargs=(self.policy,),
+            )
+            LOGGER.info(f'Pool de hashing iniciado com {self.workers} processos')
+        return self._executor
+
+    async def _submit(self, operation: str, func, *args):
+        stats = self.stats[operation]
+        if self._in_flight >= self._slots:
+            stats.rejected += 1
+            LOGGER.warning(f'Pool de hashing saturado ({self._in_flight} operações em andamento)')
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Servidor ocupado, tente novamente em instantes",
+                headers={"Retry-After": "1"},
+            )
+
+        self._in_flight += 1
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            executor = self._get_executor()
+            try:
+                return await loop.run_in_executor(executor, func, *args)
+            except BrokenProcessPool:
+                LOGGER.error('Pool de hashing quebrado (processo encerrado), recriando')
+                self._discard(executor)
+                return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._in_flight -= 1
+            stats.observe(time.perf_counter() - start)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit("verify", _verify, plain_password, hashed_password)
+
+    def needs_update(self, hashed_password: str) -> bool:
+        """True quando o hash usa um esquema depreciado ou outro custo que o da política atual."""
+        return self.context.needs_update(hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._submit("hash", _hash, password)
+
+    async def hash_many(self, passwords: List[str]) -> List[str]:
+        """Hash a batch in chunks of ``bulk_chunk_size``, each taking one admission slot while it runs."""
+        size = self.bulk_chunk_size
+        chunks = [passwords[start:start + size] for start in range(0, len(passwords), size)]
+        results = await asyncio.gather(*(self._hash_chunk(chunk) for chunk in chunks))
+        return [hashed for chunk in results for hashed in chunk]
+
+    async def _hash_chunk(self, passwords: List[str]) -> List[str]:
+        # Espera fora da admissão: chunks aguardando não ocupam vagas do verify
+        async with self._bulk_slots:
+            return await self._submit("hash", _hash_many, passwords)
+
+    def metrics(self):
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "in_flight": self._in_flight,
+            **{name: stats.as_dict() for name, stats in self.stats.items()},
+        }
+
+    def _discard(self, executor: ProcessPoolExecutor):
+        # Só a primeira das operações que falharam juntas troca o pool
+        if self._executor is executor:
+            self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self, wait: bool = False):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=settings.password_hash_workers,
+    queue_size=settings.password_hash_queue_size,
+    bulk_chunk_size=settings.password_hash_bulk_chunk_size,
+    reserved_workers=settings.password_hash_reserved_workers,
+)
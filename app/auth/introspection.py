@@ -0,0 +1,75 @@
+import hashlib
+import time
+from typing import Optional
+
+from fastapi import HTTPException
+
+from app.auth.authentication import AuthHandler, auth_handler
+from app.config.settings import settings
+from app.repository.revocation_repository import revocation_store
+from app.schemas.oauth_schema import TokenData
+from app.utils.cache import TTLCache
+
+
+class TokenIntrospector:
+    """Verifies tokens and remembers the result until the token expires.
+
+    Entries are keyed by the SHA-256 of the token, so raw tokens are never
+    held in memory, and their TTL is the time left until ``exp``. Invalid
+    tokens are not cached. Only the decoded claims are cached: every
+    introspection of a refresh token asks the revocation store whether it was
+    already rotated or its family revoked, so a token used or revoked in
+    another worker turns inactive as soon as the store sees it (within
+    ``revocation_negative_cache_seconds`` for families on the mongo backend).
+    """
+
+    def __init__(self, auth_handler: AuthHandler, cache: TTLCache, revocations=revocation_store):
+        self.auth_handler = auth_handler
+        self.cache = cache
+        self.revocations = revocations
+
+    def verify(self, token: str) -> Optional[TokenData]:
+        cache_key = hashlib.sha256(token.encode("utf-8")).digest()
+        token_data = self.cache.get(cache_key)
+        if token_data is not None:
+            if token_data.exp is None or token_data.exp > time.time():
+                return token_data
+            self.cache.invalidate(cache_key)
+
+        try:
+            token_data = self.auth_handler.decode_token(token)
+        except HTTPException:
+            return None
+
+        if token_data.exp is not None:
+            self.cache.set(cache_key, token_data, ttl=token_data.exp - time.time())
+        else:
+            self.cache.set(cache_key, token_data)
+        return token_data
+
+    async def introspect(self, token: str) -> dict:
+        """Resposta no formato da RFC 7662 (``active`` + claims do token)."""
+        token_data = self.verify(token)
+        if token_data is None or await self._is_revoked(token, token_data):
+            return {"active": False}
+        # "key" é o key_member (o client_secret do membro): nunca sai na introspecção
+        return {
+            "active": True,
+            "scope": " ".join(token_data.scopes),
+            **token_data.model_dump(exclude={"key"}),
+        }
+
+    async def _is_revoked(self, token: str, token_data: TokenData) -> bool:
+        if token_data.fid and await self.revocations.is_family_revoked(token_data.fid):
+            return True
+        if token_data.token_type != "refresh_token":
+            return False
+        # Mesmo jti usado na rotação: tokens sem jti são identificados pelo hash
+        jti = token_data.jti or hashlib.sha256(token.encode("utf-8")).hexdigest()
+        return await self.revocations.is_used(jti)
+
+
+token_introspector = TokenIntrospector(
+    auth_handler,
+    TTLCache(max_size=settings.introspection_cache_max_size, ttl=settings.access_token_expire_minutes * 60),
+)
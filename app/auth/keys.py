@@ -0,0 +1,221 @@
+import hashlib
+import hmac
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, padding, rsa
+from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature, encode_dss_signature
+from jose.utils import base64url_encode
+
+from app.config.settings import settings
+
+LOGGER = logging.getLogger(__name__)
+
+HMAC_ALGORITHMS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+
+def _b64_int(value: int) -> str:
+    return base64url_encode(value.to_bytes((value.bit_length() + 7) // 8, "big")).decode("ascii")
+
+
+class SigningKey:
+    """A parsed JWS key. Subclasses hold the ready-to-use key object."""
+
+    alg: str
+
+    def __init__(self, kid: Optional[str]):
+        self.kid = kid
+
+    @property
+    def can_sign(self) -> bool:
+        return True
+
+    def sign(self, signing_input: bytes) -> bytes:
+        raise NotImplementedError
+
+    def verify(self, signing_input: bytes, signature: bytes) -> bool:
+        raise NotImplementedError
+
+    def public_jwk(self) -> Optional[Dict]:
+        """JWK of the public part, or None for symmetric keys."""
+        return None
+
+
+class HMACKey(SigningKey):
+    def __init__(self, secret: str, alg: str = "HS256", kid: Optional[str] = None):
+        super().__init__(kid)
+        self.alg = alg
+        self._secret = secret.encode("utf-8")
+        self._digest = HMAC_ALGORITHMS[alg]
+
+    def sign(self, signing_input: bytes) -> bytes:
+        return hmac.new(self._secret, signing_input, self._digest).digest()
+
+    def verify(self, signing_input: bytes, signature: bytes) -> bool:
+        return hmac.compare_digest(self.sign(signing_input), signature)
+
+
+class RSAKey(SigningKey):
+    alg = "RS256"
+
+    def __init__(self, key, kid: str):
+        super().__init__(kid)
+        self._private = key if isinstance(key, rsa.RSAPrivateKey) else None
+        self._public = key.public_key() if self._private else key
+
+    @property
+    def can_sign(self) -> bool:
+        return self._private is not None
+
+    def sign(self, signing_input: bytes) -> bytes:
+        return self._private.sign(signing_input, padding.PKCS1v15(), hashes.SHA256())
+
+    def verify(self, signing_input: bytes, signature: bytes) -> bool:
+        try:
+            self._public.verify(signature, signing_input, padding.PKCS1v15(), hashes.SHA256())
+            return True
+        except InvalidSignature:
+            return False
+
+    def public_jwk(self) -> Dict:
+        numbers = self._public.public_numbers()
+        return {"kty": "RSA", "use": "sig", "alg": self.alg, "kid": self.kid,
+                "n": _b64_int(numbers.n), "e": _b64_int(numbers.e)}
+
+
+class ECKey(SigningKey):
+    alg = "ES256"
+    _size = 32
+
+    def __init__(self, key, kid: str):
+        super().__init__(kid)
+        self._private = key if isinstance(key, ec.EllipticCurvePrivateKey) else None
+        self._public = key.public_key() if self._private else key
+        if not isinstance(self._public.curve, ec.SECP256R1):
+            raise ValueError(f"Curva não suportada para ES256: {self._public.curve.name}")
+
+    @property
+    def can_sign(self) -> bool:
+        return self._private is not None
+
+    def sign(self, signing_input: bytes) -> bytes:
+        r, s = decode_dss_signature(self._private.sign(signing_input, ec.ECDSA(hashes.SHA256())))
+        return r.to_bytes(self._size, "big") + s.to_bytes(self._size, "big")
+
+    def verify(self, signing_input: bytes, signature: bytes) -> bool:
+        if len(signature) != 2 * self._size:
+            return False
+        r = int.from_bytes(signature[:self._size], "big")
+        s = int.from_bytes(signature[self._size:], "big")
+        try:
+            self._public.verify(encode_dss_signature(r, s), signing_input, ec.ECDSA(hashes.SHA256()))
+            return True
+        except InvalidSignature:
+            return False
+
+    def public_jwk(self) -> Dict:
+        numbers = self._public.public_numbers()
+        return {"kty": "EC", "use": "sig", "alg": self.alg, "kid": self.kid, "crv": "P-256",
+                "x": base64url_encode(numbers.x.to_bytes(self._size, "big")).decode("ascii"),
+                "y": base64url_encode(numbers.y.to_bytes(self._size, "big")).decode("ascii")}
+
+
+class Ed25519Key(SigningKey):
+    alg = "EdDSA"
+
+    def __init__(self, key, kid: str):
+        super().__init__(kid)
+        self._private = key if isinstance(key, ed25519.Ed25519PrivateKey) else None
+        self._public = key.public_key() if self._private else key
+
+    @property
+    def can_sign(self) -> bool:
+        return self._private is not None
+
+    def sign(self, signing_input: bytes) -> bytes:
+        return self._private.sign(signing_input)
+
+    def verify(self, signing_input: bytes, signature: bytes) -> bool:
+        try:
+            self._public.verify(signature, signing_input)
+            return True
+        except InvalidSignature:
+            return False
+
+    def public_jwk(self) -> Dict:
+        raw = self._public.public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+        return {"kty": "OKP", "use": "sig", "alg": self.alg, "kid": self.kid, "crv": "Ed25519",
+                "x": base64url_encode(raw).decode("ascii")}
+
+
+def load_pem_key(path: Path) -> SigningKey:
+    """Parse a PEM file (private or public key); the kid is the file name without extension."""
+    data = path.read_bytes()
+    try:
+        key = serialization.load_pem_private_key(data, password=None)
+    except ValueError:
+        key = serialization.load_pem_public_key(data)
+
+    if isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+        return RSAKey(key, kid=path.stem)
+    if isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)):
+        return ECKey(key, kid=path.stem)
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return Ed25519Key(key, kid=path.stem)
+    raise ValueError(f"Tipo de chave não suportado em {path}")
+
+
+class KeyManager:
+    """Holds the parsed signing/verification keys, indexed by kid.
+
+    HMAC algorithms use ``settings.secret_key`` and emit no kid, as before.
+    Asymmetric algorithms load every ``*.pem`` in ``jwt_keys_dir``; the key
+    named by ``jwt_active_kid`` signs, and the others stay valid for
+    verification until removed, which is how keys are rotated.
+    """
+
+    def __init__(self, active: SigningKey, keys: Dict[str, SigningKey]):
+        if not active.can_sign:
+            raise ValueError(f"A chave ativa '{active.kid}' não possui parte privada")
+        self.active = active
+        self._keys = keys
+        self._jwks = {"keys": [jwk for jwk in (key.public_jwk() for key in keys.values()) if jwk]}
+
+    @classmethod
+    def from_settings(cls, config=settings) -> "KeyManager":
+        if config.algorithm in HMAC_ALGORITHMS:
+            key = HMACKey(config.secret_key, alg=config.algorithm)
+            return cls(active=key, keys={})
+
+        if not config.jwt_keys_dir or not config.jwt_active_kid:
+            raise ValueError(f"{config.algorithm} exige jwt_keys_dir e jwt_active_kid")
+
+        keys = {}
+        for path in sorted(Path(config.jwt_keys_dir).glob("*.pem")):
+            key = load_pem_key(path)
+            keys[key.kid] = key
+        active = keys.get(config.jwt_active_kid)
+        if active is None:
+            raise ValueError(f"Chave '{config.jwt_active_kid}' não encontrada em {config.jwt_keys_dir}")
+        if active.alg != config.algorithm:
+            raise ValueError(f"A chave '{active.kid}' é {active.alg}, mas algorithm={config.algorithm}")
+        LOGGER.info(f'{len(keys)} chaves JWT carregadas; chave ativa: {active.kid}')
+        return cls(active=active, keys=keys)
+
+    def get(self, kid: Optional[str]) -> Optional[SigningKey]:
+        if kid is None:
+            return self.active if self.active.kid is None else None
+        return self._keys.get(kid)
+
+    def jwks(self) -> Dict:
+        return self._jwks
+
+
+@lru_cache(maxsize=None)
+def get_key_manager() -> KeyManager:
+    """Chaves do processo, carregadas no primeiro uso (o lifespan força a carga no startup)."""
+    return KeyManager.from_settings()
@@ -0,0 +1,246 @@
+import datetime
+import logging
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+from starlette.concurrency import run_in_threadpool
+
+from app.config.settings import settings
+from app.models.rate_limit_models import RateLimitCounter
+from app.utils.metrics import LOCKOUTS, RATE_LIMITED
+
+LOGGER = logging.getLogger(__name__)
+
+
+class RateLimitBackend:
+    """Counter store behind the rate limiter.
+
+    ``InMemoryRateLimitBackend`` keeps the counters per process, so with
+    several workers each one enforces the limits on its own;
+    ``MongoRateLimitBackend`` shares them across workers and restarts.
+    """
+
+    async def ensure_indexes(self):
+        pass
+
+    async def incr(self, key: str, window: float) -> float:
+        """Conta um evento e devolve o total estimado na janela deslizante de ``window`` segundos."""
+        raise NotImplementedError
+
+    async def reset(self, key: str):
+        raise NotImplementedError
+
+    async def lock(self, key: str, seconds: float):
+        raise NotImplementedError
+
+    async def locked_for(self, key: str) -> float:
+        """Segundos restantes de bloqueio de ``key`` (0 se não estiver bloqueada)."""
+        raise NotImplementedError
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Sliding-window counters kept in a dict, O(1) memory per key.
+
+    Each key holds the counts of the current and previous fixed windows; the
+    previous one is weighted by how much of it still overlaps the sliding
+    window. Idle keys are swept at most once per ``prune_interval`` seconds.
+    """
+
+    def __init__(self, prune_interval: float = 60.0):
+        # key -> [início da janela atual, contagem anterior, contagem atual, tamanho da janela]
+        self._counters: Dict[str, list] = {}
+        self._locks: Dict[str, float] = {}
+        self.prune_interval = prune_interval
+        self._next_prune = time.monotonic() + prune_interval
+
+    async def incr(self, key: str, window: float) -> float:
+        now = time.monotonic()
+        self._prune(now)
+        start = now - now % window
+        entry = self._counters.get(key)
+        if entry is None or entry[0] < start - window:
+            entry = self._counters[key] = [start, 0, 0, window]
+        elif entry[0] < start:
+            entry[0], entry[1], entry[2] = start, entry[2], 0
+        entry[2] += 1
+        return entry[1] * (1 - (now - start) / window) + entry[2]
+
+    async def reset(self, key: str):
+        self._counters.pop(key, None)
+
+    async def lock(self, key: str, seconds: float):
+        self._locks[key] = time.monotonic() + seconds
+
+    async def locked_for(self, key: str) -> float:
+        until = self._locks.get(key)
+        if until is None:
+            return 0.0
+        remaining = until - time.monotonic()
+        if remaining <= 0:
+            del self._locks[key]
+            return 0.0
+        return remaining
+
+    def _prune(self, now: float):
+        if now < self._next_prune:
+            return
+        self._next_prune = now + self.prune_interval
+        for key in [key for key, entry in self._counters.items() if entry[0] + 2 * entry[3] <= now]:
+            del self._counters[key]
+        for key in [key for key, until in self._locks.items() if until <= now]:
+            del self._locks[key]
+
+
+class MongoRateLimitBackend(RateLimitBackend):
+    """The same sliding-window counters in one Mongo document per key.
+
+    ``incr`` is a single atomic ``find_one_and_update`` with an update
+    pipeline that rolls the window and counts the event, so concurrent
+    workers never lose a count. Times are wall-clock seconds, shared by all
+    processes; a TTL index drops idle keys and expired lockouts.
+    """
+
+    async def ensure_indexes(self):
+        try:
+            await run_in_threadpool(RateLimitCounter.ensure_indexes)
+        except PyMongoError as e:
+            LOGGER.error(f'Falha ao criar índices do rate limit: {e}')
+
+    async def incr(self, key: str, window: float) -> float:
+        now = time.time()
+        start = now - now % window
+        update = [{"$set": {
+            "previous": {"$switch": {"branches": [
+                {"case": {"$eq": ["$start", start]}, "then": "$previous"},
+                {"case": {"$eq": ["$start", start - window]}, "then": "$current"},
+            ], "default": 0}},
+            "current": {"$cond": [{"$eq": ["$start", start]}, {"$add": ["$current", 1]}, 1]},
+            "start": start,
+            "expires_at": _to_datetime(start + 2 * window),
+        }}]
+        entry = await run_in_threadpool(
+            RateLimitCounter._get_collection().find_one_and_update, {"_id": key}, update,
+            upsert=True, return_document=ReturnDocument.AFTER,
+        )
+        return entry["previous"] * (1 - (now - start) / window) + entry["current"]
+
+    async def reset(self, key: str):
+        await run_in_threadpool(RateLimitCounter._get_collection().delete_one, {"_id": key})
+
+    async def lock(self, key: str, seconds: float):
+        until = time.time() + seconds
+        await run_in_threadpool(
+            RateLimitCounter._get_collection().replace_one,
+            {"_id": key}, {"until": until, "expires_at": _to_datetime(until)}, upsert=True,
+        )
+
+    async def locked_for(self, key: str) -> float:
+        entry = await run_in_threadpool(RateLimitCounter._get_collection().find_one, {"_id": key}, {"until": 1})
+        if entry is None:
+            return 0.0
+        return max(0.0, entry["until"] - time.time())
+
+
+def _to_datetime(timestamp: float) -> datetime.datetime:
+    return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).replace(tzinfo=None)
+
+
+def get_rate_limit_backend() -> RateLimitBackend:
+    if settings.rate_limit_backend == "mongo":
+        return MongoRateLimitBackend()
+    return InMemoryRateLimitBackend()
+
+
+def parse_rule(rule: str) -> Tuple[int, float]:
+    """``"10/60"`` -> (10 requisições, janela de 60 segundos)."""
+    limit, _, window = rule.partition("/")
+    return int(limit), float(window or 60)
+
+
+class RateLimiter:
+    """Per-grant request limits plus lockout after repeated failures.
+
+    ``check`` runs before any DB lookup or bcrypt work: it rejects locked
+    identities and counts the request against every configured dimension
+    (``ip``, ``username``, ``client_id``). ``record_failure`` locks an
+    identity for ``lockout_seconds`` after ``lockout_threshold`` failures
+    inside ``lockout_window``; ``record_success`` clears the failure count.
+    """
+
+    LOCKOUT_DIMENSIONS = ("username", "client_id")
+
+    def __init__(
+            self,
+            backend: RateLimitBackend,
+            limits: Dict[str, Dict[str, str]],
+            lockout_threshold: int,
+            lockout_window: float,
+            lockout_seconds: float,
+            enabled: bool = True,
+    ):
+        self.backend = backend
+        self.enabled = enabled
+        self.rules: Dict[str, List[Tuple[str, int, float]]] = {
+            grant_type: [(dimension, *parse_rule(rule)) for dimension, rule in dimensions.items()]
+            for grant_type, dimensions in limits.items()
+        }
+        self.lockout_threshold = lockout_threshold
+        self.lockout_window = lockout_window
+        self.lockout_seconds = lockout_seconds
+
+    async def check(self, grant_type: str, identities: Dict[str, Optional[str]]):
+        if not self.enabled:
+            return
+        for dimension in self.LOCKOUT_DIMENSIONS:
+            value = identities.get(dimension)
+            if value:
+                remaining = await self.backend.locked_for(f"lock:{dimension}:{value}")
+                if remaining:
+                    RATE_LIMITED.inc(grant_type, "lockout")
+                    raise _too_many_requests(remaining)
+
+        for dimension, limit, window in self.rules.get(grant_type, ()):
+            value = identities.get(dimension)
+            if not value:
+                continue
+            count = await self.backend.incr(f"rate:{grant_type}:{dimension}:{value}", window)
+            if count > limit:
+                RATE_LIMITED.inc(grant_type, dimension)
+                LOGGER.info(f'Limite de requisições excedido: {grant_type} por {dimension}')
+                raise _too_many_requests(window)
+
+    async def record_failure(self, grant_type: str, dimension: str, value: Optional[str]):
+        if not self.enabled or not value:
+            return
+        failures = await self.backend.incr(f"fail:{dimension}:{value}", self.lockout_window)
+        if failures >= self.lockout_threshold:
+            await self.backend.lock(f"lock:{dimension}:{value}", self.lockout_seconds)
+            await self.backend.reset(f"fail:{dimension}:{value}")
+            LOCKOUTS.inc(grant_type)
+            LOGGER.warning(f'{dimension} bloqueado por {self.lockout_seconds:.0f}s após falhas repetidas: {value}')
+
+    async def record_success(self, dimension: str, value: Optional[str]):
+        if self.enabled and value:
+            await self.backend.reset(f"fail:{dimension}:{value}")
+
+
+def _too_many_requests(retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Muitas tentativas, tente novamente mais tarde",
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+rate_limiter = RateLimiter(
+    get_rate_limit_backend(),
+    limits=settings.rate_limits,
+    lockout_threshold=settings.lockout_threshold,
+    lockout_window=settings.lockout_window_seconds,
+    lockout_seconds=settings.lockout_seconds,
+    enabled=settings.rate_limit_enabled,
+)
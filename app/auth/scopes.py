@@ -0,0 +1,95 @@
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordBearer, SecurityScopes
+
+from app.auth.introspection import token_introspector
+from app.config.settings import settings
+from app.schemas.oauth_schema import TokenData
+
+
+class ScopeRegistry:
+    """Scopes per privilege level, compiled once into bitmasks.
+
+    Every known scope gets one bit; each privilege level (for members and,
+    separately, for client_credentials clients) becomes the OR of its
+    scopes' bits plus the tuple of scopes granted when none is requested.
+    Checking a scope is a dict lookup and an AND. Levels missing from the
+    configuration fall back to the lowest configured level.
+    """
+
+    def __init__(self, privilege_scopes: Dict[int, Iterable[str]], client_scopes: Dict[int, Iterable[str]]):
+        self.bits: Dict[str, int] = {}
+        self.members = self._compile(privilege_scopes)
+        self.clients = self._compile(client_scopes)
+
+    def _compile(self, levels: Dict[int, Iterable[str]]) -> Dict[int, Tuple[int, Tuple[str, ...]]]:
+        compiled = {}
+        for level, scopes in sorted(levels.items()):
+            scopes = tuple(dict.fromkeys(scopes))
+            compiled[int(level)] = (self.mask(scopes, register=True), scopes)
+        return compiled
+
+    def mask(self, scopes: Iterable[str], register: bool = False) -> int:
+        mask = 0
+        for scope in scopes:
+            bit = self.bits.get(scope)
+            if bit is None:
+                if not register:
+                    continue
+                bit = self.bits[scope] = 1 << len(self.bits)
+            mask |= bit
+        return mask
+
+    def grant(self, requested: Optional[Iterable[str]], privilege_level: Optional[int], client: bool = False) -> List[str]:
+        """Escopos concedidos: os solicitados que o nível permite, ou os padrão do nível se nada foi pedido."""
+        levels = self.clients if client else self.members
+        allowed, defaults = levels.get(privilege_level) or levels[min(levels)]
+        if not requested:
+            return list(defaults)
+        bits = self.bits
+        return [scope for scope in dict.fromkeys(requested) if bits.get(scope, 0) & allowed]
+
+    @lru_cache(maxsize=256)
+    def required(self, scopes: Tuple[str, ...]) -> Tuple[int, frozenset]:
+        """Máscara dos escopos exigidos por uma rota e os que o registro não conhece."""
+        return self.mask(scopes), frozenset(scope for scope in scopes if scope not in self.bits)
+
+    def satisfies(self, granted: Iterable[str], required: Tuple[str, ...]) -> bool:
+        required_mask, unknown = self.required(required)
+        granted = tuple(granted)
+        if unknown and not unknown.issubset(granted):
+            return False
+        return self.mask(granted) & required_mask == required_mask
+
+
+scope_registry = ScopeRegistry(settings.privilege_scopes, settings.client_scopes)
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/oauth/token")
+
+
+async def get_token_data(request: Request, token: str = Depends(oauth2_scheme)) -> TokenData:
+    """Access token do header Authorization, verificado uma vez por requisição (e cacheado pelo introspector)."""
+    token_data = getattr(request.state, "token_data", None)
+    if token_data is None:
+        token_data = token_introspector.verify(token)
+        if token_data is None or token_data.token_type != "access_token":
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        request.state.token_data = token_data
+    return token_data
+
+
+async def require_scopes(security_scopes: SecurityScopes, token_data: TokenData = Depends(get_token_data)) -> TokenData:
+    """Dependência para ``Security(require_scopes, scopes=[...])`` nas rotas protegidas."""
+    if not scope_registry.satisfies(token_data.scopes, tuple(security_scopes.scopes)):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permissões insuficientes",
+            headers={"WWW-Authenticate": f'Bearer scope="{security_scopes.scope_str}"'},
+        )
+    return token_data
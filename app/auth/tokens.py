@@ -0,0 +1,108 @@
+import calendar
+import json
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Optional
+
+from jose.exceptions import ExpiredSignatureError, JWSError, JWTClaimsError, JWTError
+from jose.utils import base64url_decode, base64url_encode
+
+from app.auth.keys import KeyManager, SigningKey
+
+TIME_CLAIMS = ("exp", "iat", "nbf")
+
+
+def dumps(value) -> bytes:
+    """Compact JSON, laid out as python-jose serializes claims."""
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+@lru_cache(maxsize=32)
+def header_segment(alg: str, kid: Optional[str]) -> bytes:
+    """Encoded JOSE header; constant per key, so it is built once."""
+    header = {"alg": alg, "typ": "JWT"}
+    if kid is not None:
+        header["kid"] = kid
+    return base64url_encode(json.dumps(header, separators=(",", ":"), sort_keys=True).encode("utf-8"))
+
+
+def sign(payload: bytes, key: SigningKey) -> str:
+    """Compact JWS for an already serialized claims ``payload``."""
+    signing_input = header_segment(key.alg, key.kid) + b"." + base64url_encode(payload)
+    return (signing_input + b"." + base64url_encode(key.sign(signing_input))).decode("utf-8")
+
+
+def encode(claims: Dict, key: SigningKey) -> str:
+    """Sign ``claims`` as a compact JWS, laid out like python-jose's ``jwt.encode``."""
+    if any(isinstance(claims.get(claim), datetime) for claim in TIME_CLAIMS):
+        claims = dict(claims)
+        for claim in TIME_CLAIMS:
+            if isinstance(claims.get(claim), datetime):
+                claims[claim] = calendar.timegm(claims[claim].utctimetuple())
+    return sign(dumps(claims), key)
+
+
+class ClaimsTemplate:
+    """Claims shared by several tokens, serialized once.
+
+    ``render(extra)`` produces the same bytes as ``dumps({**base, **extra})``
+    as long as ``extra`` does not repeat a key of ``base`` (a repeated key
+    would keep its original position in the merged dict), which is checked
+    up front by ``compatible``.
+    """
+
+    __slots__ = ("keys", "_prefix")
+
+    def __init__(self, base: Dict):
+        self.keys = frozenset(base)
+        # '{"sub":...,"key":...' sem o '}' final, pronto para receber os claims de cada token
+        self._prefix = dumps(base)[:-1] + b"," if base else b"{"
+
+    def compatible(self, extra: Dict) -> bool:
+        return self.keys.isdisjoint(extra)
+
+    def render(self, extra: Dict) -> bytes:
+        return self._prefix + dumps(extra)[1:]
+
+
+def decode(token: str, keys: KeyManager) -> Dict:
+    """Verify signature and time claims of ``token`` and return its claims.
+
+    Raises the python-jose exceptions (``JWTError`` and subclasses) so callers
+    keep handling errors the same way.
+    """
+    try:
+        signing_input, _, encoded_signature = token.encode("utf-8").rpartition(b".")
+        encoded_header, _, encoded_claims = signing_input.partition(b".")
+        header = json.loads(base64url_decode(encoded_header))
+        signature = base64url_decode(encoded_signature)
+    except (ValueError, TypeError) as e:
+        raise JWTError(f"Token malformado: {e}")
+
+    if not isinstance(header, dict):
+        raise JWTError("Cabeçalho inválido")
+    key = keys.get(header.get("kid"))
+    if key is None or header.get("alg") != key.alg:
+        raise JWSError("Chave ou algoritmo não reconhecido")
+    if not key.verify(signing_input, signature):
+        raise JWSError("Assinatura inválida")
+
+    try:
+        claims = json.loads(base64url_decode(encoded_claims))
+    except ValueError as e:
+        raise JWTError(f"Payload inválido: {e}")
+    if not isinstance(claims, dict):
+        raise JWTError("Payload inválido")
+
+    now = time.time()
+    exp = claims.get("exp")
+    if exp is not None:
+        if not isinstance(exp, (int, float)):
+            raise JWTClaimsError("exp deve ser numérico")
+        if exp <= now:
+            raise ExpiredSignatureError("Signature has expired.")
+    nbf = claims.get("nbf")
+    if nbf is not None and isinstance(nbf, (int, float)) and nbf > now:
+        raise JWTClaimsError("The token is not yet valid (nbf)")
+    return claims
@@ -1,12 +1,224 @@
+import asyncio
+import logging
+import os
+from typing import Awaitable, Callable, List, Optional, Set
+
+import pymongo
 from mongoengine import connect, disconnect
+from mongoengine.connection import get_db
+from pymongo import AsyncMongoClient
+from pymongo.errors import PyMongoError
+from pymongo.monitoring import ConnectionCheckOutFailedReason, ConnectionPoolListener
+from starlette.concurrency import run_in_threadpool
+
 from app.config.settings import settings
 
+LOGGER = logging.getLogger(__name__)
+
+
+class PoolStats(ConnectionPoolListener):
+    """Connection pool state from PyMongo's CMAP events.
+
+    The counters are updated from PyMongo's threads without locks; they are
+    only read for health checks and metrics, where an off-by-one is harmless.
+    """
+
+    def __init__(self):
+        self.open = 0
+        self.checked_out = 0
+        self.checkout_timeouts = 0
+        self.paused: Set = set()
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        self.paused.discard(event.address)
+
+    def pool_cleared(self, event):
+        self.paused.add(event.address)
+
+    def pool_closed(self, event):
+        self.paused.discard(event.address)
+
+    def connection_created(self, event):
+        self.open += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self.open -= 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        if event.reason == ConnectionCheckOutFailedReason.TIMEOUT:
+            self.checkout_timeouts += 1
+
+    def connection_checked_out(self, event):
+        self.checked_out += 1
+
+    def connection_checked_in(self, event):
+        self.checked_out -= 1
+
+
+def mongo_client_options():
+    """Opções de pool compartilhadas pelos clientes síncrono e assíncrono."""
+    return {
+        "maxPoolSize": settings.mongo_max_pool_size,
+        "minPoolSize": settings.mongo_min_pool_size,
+        "waitQueueTimeoutMS": settings.mongo_wait_queue_timeout_ms,
+        "readPreference": settings.mongo_read_preference,
+        "event_listeners": [pool_stats],
+    }
+
+
+class MongoConnectionManager:
+    """Owns the per-process Mongo clients.
+
+    Nothing connects at import: clients are created on first use and tied
+    to the pid that created them, so a client inherited through ``fork``
+    (gunicorn ``preload_app``) is dropped and reopened in the worker. Only
+    the clients required by the configured backends are opened. A Mongo
+    that is down at startup only leaves ``ready`` False: the readiness
+    probe retries the warm-up, and the hooks registered with ``on_ready``
+    (index creation) run once it succeeds.
+    """
+
+    def __init__(self):
+        self._pid: Optional[int] = None
+        self._sync_connected = False
+        self._async_client: Optional[AsyncMongoClient] = None
+        self._ready_hooks: List[Callable[[], Awaitable[None]]] = []
+        self.ready = False
+
+    @property
+    def uses_sync_client(self) -> bool:
+        return (
+            settings.repository_backend == "mongoengine"
+            or settings.revocation_store_backend == "mongo"
+            or (settings.rate_limit_enabled and settings.rate_limit_backend == "mongo")
+        )
+
+    @property
+    def uses_async_client(self) -> bool:
+        return settings.repository_backend == "async"
+
+    def _check_pid(self):
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        if self._pid is not None:
+            # Cliente herdado do processo pai: não é seguro reutilizar os sockets dele
+            if self._sync_connected:
+                disconnect()
+            self._sync_connected = False
+            self._async_client = None
+            self.ready = False
+        self._pid = pid
+
+    def connect_sync(self):
+        self._check_pid()
+        if not self._sync_connected:
+            connect(settings.mongo_database, host=settings.mongo_url, **mongo_client_options())
+            self._sync_connected = True
+
+    def get_async_client(self) -> AsyncMongoClient:
+        self._check_pid()
+        if self._async_client is None:
+            self._async_client = AsyncMongoClient(settings.mongo_url, **mongo_client_options())
+        return self._async_client
+
+    async def ping(self, timeout: Optional[float] = None):
+        """Pinga cada cliente em uso; levanta PyMongoError se algum não responder."""
+        with pymongo.timeout(timeout):
+            if self.uses_sync_client:
+                self.connect_sync()
+                await run_in_threadpool(get_db().command, "ping")
+            if self.uses_async_client:
+                await self.get_async_client().admin.command("ping")
+
+    def on_ready(self, hook: Callable[[], Awaitable[None]]):
+        """Registra ``hook`` para rodar a cada warm-up bem-sucedido."""
+        self._ready_hooks.append(hook)
+
+    async def warm_up(self, timeout: Optional[float] = None) -> bool:
+        """Conecta, valida com ping e abre ``mongo_warmup_connections`` conexões antes do primeiro request.
+
+        Se o Mongo não responder, registra o erro e deixa ``ready`` False em
+        vez de derrubar o worker; retorna se ficou pronto.
+        """
+        if self.uses_sync_client or self.uses_async_client:
+            try:
+                await self.ping(timeout)
+                # Pings concorrentes obrigam o pool a abrir uma conexão para cada um
+                await asyncio.gather(
+                    *(self.ping(timeout) for _ in range(max(0, settings.mongo_warmup_connections - 1)))
+                )
+            except PyMongoError as e:
+                LOGGER.warning(f'Mongo indisponível, o readiness probe tentará de novo: {e}')
+                self.ready = False
+                return False
+        for hook in self._ready_hooks:
+            await hook()
+        self.ready = True
+        LOGGER.info(f'Mongo pronto com {pool_stats.open} conexões abertas')
+        return True
+
+    async def close(self):
+        self.ready = False
+        self._ready_hooks.clear()
+        if self._pid != os.getpid():
+            return
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+        if self._sync_connected:
+            disconnect()
+            self._sync_connected = False
+
+    async def health(self):
+        """Estado do pool para o readiness probe; ``ready`` só é True se o Mongo responder.
+
+        Enquanto o warm-up não tiver dado certo, cada chamada tenta de novo.
+        """
+        if not self.ready:
+            await self.warm_up(settings.mongo_ping_timeout_ms / 1000)
+        state = {
+            "ready": self.ready and not pool_stats.paused,
+            "pool": {
+                "open": pool_stats.open,
+                "checked_out": pool_stats.checked_out,
+                "max_size": settings.mongo_max_pool_size,
+                "checkout_timeouts": pool_stats.checkout_timeouts,
+            },
+        }
+        if state["ready"]:
+            try:
+                await self.ping(settings.mongo_ping_timeout_ms / 1000)
+            except PyMongoError as e:
+                LOGGER.warning(f'Readiness: ping ao Mongo falhou: {e}')
+                state["ready"] = False
+        return state
+
+
+pool_stats = PoolStats()
+mongo_manager = MongoConnectionManager()
+
+
+def get_async_client() -> AsyncMongoClient:
+    return mongo_manager.get_async_client()
+
+
+def get_async_database():
+    return get_async_client()[settings.mongo_database]
+
 
-connect_mongo = connect(settings.mongo_database, host=settings.mongo_url)
-disconnect_mongo = disconnect
+async def on_application_startup():
+    await mongo_manager.warm_up()
 
-def on_application_startup():
-    connect_mongo()
 
-def on_application_shutdown():
-    disconnect_mongo()
\ No newline at end of file
+async def on_application_shutdown():
+    await mongo_manager.close()
@@ -0,0 +1,73 @@
+from fastapi import Request
+
+from app.auth.authentication import AuthHandler, auth_handler
+from app.auth.client_registry import ClientRegistry, client_registry
+from app.auth.hashing import PasswordHasher, password_hasher
+from app.auth.introspection import TokenIntrospector, token_introspector
+from app.auth.rate_limit import RateLimiter, rate_limiter
+from app.auth.scopes import ScopeRegistry, scope_registry
+from app.controllers.auth_controller import AuthenticateController
+from app.controllers.member_controller import MemberController
+from app.repository.base_repository import BaseRepository
+from app.repository.repository_factory import get_member_repository
+from app.repository.revocation_repository import revocation_store
+
+
+class Container:
+    """Application-scoped dependencies, built once in the startup hook.
+
+    The controllers are stateless, so a single instance of each (and of the
+    repository and ``AuthHandler`` they hold) is shared by every request.
+    """
+
+    def __init__(
+            self,
+            member_repository: BaseRepository,
+            auth_handler: AuthHandler = auth_handler,
+            password_hasher: PasswordHasher = password_hasher,
+            client_registry: ClientRegistry = client_registry,
+            token_introspector: TokenIntrospector = token_introspector,
+            revocation_store=revocation_store,
+            rate_limiter: RateLimiter = rate_limiter,
+            scope_registry: ScopeRegistry = scope_registry,
+    ):
+        self.member_repository = member_repository
+        self.auth_handler = auth_handler
+        self.password_hasher = password_hasher
+        self.client_registry = client_registry
+        self.token_introspector = token_introspector
+        self.revocation_store = revocation_store
+        self.rate_limiter = rate_limiter
+        self.scope_registry = scope_registry
+        self.auth_controller = AuthenticateController(
+            member_repository=member_repository,
+            auth_handler=auth_handler,
+            password_hasher=password_hasher,
+            client_registry=client_registry,
+            token_introspector=token_introspector,
+            revocation_store=revocation_store,
+            rate_limiter=rate_limiter,
+            scope_registry=scope_registry,
+        )
+        self.member_controller = MemberController(
+            member_repository=member_repository,
+            auth_handler=auth_handler,
+            password_hasher=password_hasher,
+        )
+
+    @classmethod
+    def from_settings(cls) -> "Container":
+        # As escritas do repositório removem o cliente alterado do registro deste processo
+        return cls(get_member_repository(client_registry))
+
+
+def get_container(request: Request) -> Container:
+    return request.app.state.container
+
+
+def get_auth_controller(request: Request) -> AuthenticateController:
+    return request.app.state.container.auth_controller
+
+
+def get_member_controller(request: Request) -> MemberController:
+    return request.app.state.container.member_controller
@@ -0,0 +1,60 @@
+"""Gunicorn configuration for production.
+
+    gunicorn -c python:app.config.gunicorn_conf "app.application:get_app()"
+
+Every value comes from ``Settings`` (``WEB_*`` / ``UVICORN_*`` in the
+environment), so the container and ``python -m app`` share one source.
+"""
+import os
+
+from uvicorn.workers import UvicornWorker
+
+from app.config.settings import settings
+
+bind = f"{settings.host}:{settings.fastapi_port}"
+workers = settings.web_workers or os.cpu_count() or 1
+worker_class = "app.config.gunicorn_conf.TunedUvicornWorker"
+keepalive = settings.web_keepalive
+backlog = settings.web_backlog
+timeout = settings.web_timeout
+graceful_timeout = settings.web_graceful_timeout
+max_requests = settings.web_max_requests
+max_requests_jitter = settings.web_max_requests_jitter
+preload_app = settings.web_preload
+# Heartbeat dos workers em memória: em containers /tmp costuma ser overlay em disco
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+accesslog = None
+loglevel = settings.log_level
+
+# O store em memória é por processo: com vários workers um refresh token reusado em outro worker passaria
+if workers > 1:
+    if settings.revocation_store_backend is None:
+        settings.revocation_store_backend = "mongo"
+    elif settings.revocation_store_backend == "memory":
+        raise RuntimeError(
+            f"REVOCATION_STORE_BACKEND=memory não detecta reuso de refresh token entre {workers} workers; "
+            "use mongo ou WEB_WORKERS=1"
+        )
+
+# Idem para o rate limit: em memória cada worker daria o limite inteiro, e reciclar o worker zera os bloqueios
+if workers > 1 and settings.rate_limit_enabled:
+    if settings.rate_limit_backend is None:
+        settings.rate_limit_backend = "mongo"
+    elif settings.rate_limit_backend == "memory":
+        raise RuntimeError(
+            f"RATE_LIMIT_BACKEND=memory multiplica os limites por {workers} workers; "
+            "use mongo ou WEB_WORKERS=1"
+        )
+
+# Cada worker tem o próprio pool de bcrypt; sem valor explícito, os núcleos são divididos entre eles
+if not settings.password_hash_workers:
+    settings.password_hash_workers = max(1, (os.cpu_count() or 1) // workers)
+
+
+class TunedUvicornWorker(UvicornWorker):
+    CONFIG_KWARGS = {
+        "loop": settings.uvicorn_loop,
+        "http": settings.uvicorn_http,
+        "lifespan": "on",
+        "proxy_headers": True,
+    }
@@ -1,14 +1,51 @@
-from typing import Awaitable, Callable
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable
 from fastapi import FastAPI
 
+from app.auth.keys import get_key_manager
+from app.config.connection import mongo_manager
+from app.config.container import Container
+from app.repository.revocation_repository import revocation_store
+from app.utils.logger import setup_logger
 
-def startup(app: FastAPI) -> Callable[[], Awaitable[None]]:
+LOGGER = logging.getLogger(__name__)
+
+
+def startup(app: FastAPI, on_startup: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
     async def _startup() -> None:
-        pass
+        setup_logger()
+        LOGGER.info("Iniciando aplicação...")
+        # Chaves inválidas derrubam o worker aqui, e não no primeiro login
+        get_key_manager()
+        container = app.state.container = Container.from_settings()
+        # Índices rodam quando o Mongo fica pronto: no warm-up abaixo ou, se ele
+        # estiver fora do ar agora, quando o readiness probe conseguir conectar
+        mongo_manager.on_ready(container.member_repository.ensure_indexes)
+        mongo_manager.on_ready(revocation_store.ensure_indexes)
+        mongo_manager.on_ready(container.rate_limiter.backend.ensure_indexes)
+        await on_startup()
+        await container.client_registry.start(container.member_repository)
     return _startup
 
-def shutdown(app: FastAPI) -> Callable[[], Awaitable[None]]:
+def shutdown(app: FastAPI, on_shutdown: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
     async def _shutdown() -> None:
-        pass
+        container = app.state.container
+        await container.client_registry.stop()
+        container.password_hasher.shutdown()
+        await on_shutdown()
     return _shutdown
 
+def lifespan(
+        on_startup: Callable[[], Awaitable[None]],
+        on_shutdown: Callable[[], Awaitable[None]],
+) -> Callable[[FastAPI], AsyncIterator[None]]:
+    """Lifespan do app: tudo que abre recursos (logger, chaves, Mongo, container) roda aqui, não no import."""
+    @asynccontextmanager
+    async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+        await startup(app, on_startup)()
+        try:
+            yield
+        finally:
+            await shutdown(app, on_shutdown)()
+    return _lifespan
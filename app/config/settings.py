@@ -1,10 +1,11 @@
+from typing import Dict, List, Literal, Optional
+
 from pydantic_settings import BaseSettings
-from dotenv import load_dotenv
 from pathlib import Path
 
 
+# Lido só pelo pydantic-settings (env_file); variáveis de ambiente têm precedência
 env_path = Path(__file__).resolve().parent.parent.parent / '.env'
-load_dotenv(dotenv_path=env_path)
 
 
 class Settings(BaseSettings):
@@ -20,6 +21,79 @@ class Settings(BaseSettings):
     secret_key: str
     algorithm: str
     access_token_expire_minutes: int
+    jwt_keys_dir: Optional[str] = None  # *.pem por kid, usado por RS256/ES256/EdDSA
+    jwt_active_kid: Optional[str] = None
+    introspection_cache_max_size: int = 50000
+    introspection_batch_max_tokens: int = 100
+    # Sem valor: "mongo" com mais de um worker (ver gunicorn_conf), "memory" num processo só
+    revocation_store_backend: Optional[Literal["memory", "mongo"]] = None
+    revocation_negative_cache_seconds: float = 5.0  # famílias não revogadas, no backend mongo
+    password_hash_workers: int = 0  # 0 = número de CPUs
+    password_hash_queue_size: int = 64
+    password_hash_bulk_chunk_size: int = 4  # senhas por tarefa do pool no hash em lote (importação)
+    password_hash_reserved_workers: int = 1  # processos que o hash em lote não ocupa, livres para o login
+    # O primeiro esquema gera os hashes novos; os demais só são verificados e migram no login
+    password_schemes: List[Literal["bcrypt", "argon2"]] = ["bcrypt"]
+    bcrypt_rounds: int = 12
+    argon2_memory_cost: int = 65536  # KiB
+    argon2_time_cost: int = 3
+    argon2_parallelism: int = 4
+    password_rehash_on_login: bool = True
+    repository_backend: Literal["mongoengine", "async", "memory"] = "mongoengine"
+    mongo_max_pool_size: int = 100
+    mongo_min_pool_size: int = 0
+    mongo_wait_queue_timeout_ms: int = 2000
+    mongo_read_preference: str = "primary"
+    mongo_warmup_connections: int = 4
+    mongo_ping_timeout_ms: int = 1000
+    oauth_max_body_bytes: int = 8192  # corpo do /oauth/token
+    import_batch_size: int = 1000
+    import_max_reported_errors: int = 1000
+    # Consultas simultâneas ao mesmo membro viram uma só; o timeout vale para a consulta compartilhada
+    member_singleflight_enabled: bool = True
+    member_lookup_timeout_seconds: float = 5.0
+    member_cache_enabled: bool = True
+    member_cache_max_size: int = 10000
+    member_cache_ttl_seconds: float = 60.0
+    client_registry_enabled: bool = True
+    # Escopos por nível de privilégio; o primeiro nível é o padrão para níveis não listados
+    privilege_scopes: Dict[int, List[str]] = {
+        1: ["read:profile"],
+        2: ["read:profile", "update:profile"],
+        3: ["read:profile", "update:profile", "read:admin"],
+        4: ["read:profile", "update:profile", "read:admin", "write:admin"],
+        5: ["read:profile", "update:profile", "read:admin", "write:admin", "delete:admin"],
+    }
+    client_scopes: Dict[int, List[str]] = {1: ["read:api", "write:api"]}
+    rate_limit_enabled: bool = True
+    # Sem valor: "mongo" com mais de um worker (ver gunicorn_conf), "memory" num processo só
+    rate_limit_backend: Optional[Literal["memory", "mongo"]] = None
+    # Por grant type: dimensão (ip, username, client_id) -> "requisições/segundos"
+    rate_limits: Dict[str, Dict[str, str]] = {
+        "password": {"ip": "30/60", "username": "10/60"},
+        "client_credentials": {"ip": "300/60", "client_id": "120/60"},
+        "refresh_token": {"ip": "300/60"},
+    }
+    lockout_threshold: int = 5
+    lockout_window_seconds: float = 900.0
+    lockout_seconds: float = 900.0
+    client_registry_refresh_seconds: float = 10.0
+    client_registry_full_sync_seconds: float = 300.0  # recarga completa; remove membros apagados
+    client_registry_max_size: int = 10000  # clientes mantidos em memória; os demais vão ao banco
+    log_body_max_bytes: int = 2048
+    log_format: Literal["json", "text"] = "json"
+    log_sampling: Dict[str, float] = {}  # ex.: {"app.utils.middleware": 0.1}
+    metrics_enabled: bool = True
+    web_workers: int = 0  # 0 = número de CPUs
+    web_keepalive: int = 5
+    web_backlog: int = 2048
+    web_timeout: int = 30
+    web_graceful_timeout: int = 30
+    web_max_requests: int = 10000  # 0 = nunca reciclar o worker
+    web_max_requests_jitter: int = 1000
+    web_preload: bool = True
+    uvicorn_loop: Literal["auto", "uvloop", "asyncio"] = "auto"
+    uvicorn_http: Literal["auto", "httptools", "h11"] = "auto"
 
     class Config:
         env_file = str(env_path)
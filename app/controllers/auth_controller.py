@@ -1,25 +1,50 @@
+import asyncio
+import hashlib
 import logging
+import time
 from datetime import timedelta
-from jose import JWTError, jwt
 
 from fastapi import HTTPException, status
 
 from app.auth.authentication import AuthHandler
-from app.repository.member_repository import MemberRepository
+from app.auth.client_registry import ClientRegistry
+from app.auth.hashing import PasswordHasher
+from app.auth.introspection import TokenIntrospector
+from app.auth.rate_limit import RateLimiter
+from app.auth.scopes import ScopeRegistry
+from app.repository.base_repository import BaseRepository
+from app.repository.revocation_repository import InMemoryRevocationStore
 from app.schemas.oauth_schema import Token
-from app.utils.logger import setup_logger
 from app.config.settings import settings
+from app.utils.metrics import AUTH_FAILURES, AUTH_STAGE_LATENCY
 
-setup_logger()
 LOGGER = logging.getLogger(__name__)
 
 class AuthenticateController:
-    def __init__(self):
-        self.member_repository = MemberRepository()
-        self.auth_handler = AuthHandler()
-
-
-    def oauth_login(self, form_data):
+    def __init__(
+            self,
+            member_repository: BaseRepository,
+            auth_handler: AuthHandler,
+            password_hasher: PasswordHasher,
+            client_registry: ClientRegistry,
+            token_introspector: TokenIntrospector,
+            revocation_store: InMemoryRevocationStore,
+            rate_limiter: RateLimiter,
+            scope_registry: ScopeRegistry,
+    ):
+        self.member_repository = member_repository
+        self.auth_handler = auth_handler
+        self.password_hasher = password_hasher
+        self.client_registry = client_registry
+        self.token_introspector = token_introspector
+        self.revocation_store = revocation_store
+        self.rate_limiter = rate_limiter
+        self.scope_registry = scope_registry
+        # Referências às regravações de hash em andamento (o event loop guarda só referências fracas)
+        self._background_tasks = set()
+
+
+    async def oauth_login(self, form_data):
         """Login via OAuth 2.0 password grant type"""
         if form_data.grant_type != "password":
             raise HTTPException(
@@ -29,132 +54,159 @@ class AuthenticateController:
 
         email = form_data.username  # No OAuth, o parâmetro é username, mas usamos email
         password = form_data.password
-        requested_scopes = form_data.scope.split() if form_data.scope else []
+        requested_scopes = form_data.scopes  # PasswordGrant já separa o parâmetro scope
 
         # Verificar client_id e client_secret se necessário
         # if form_data.client_id != settings.client_id or form_data.client_secret != settings.client_secret:
         #    raise HTTPException(status_code=401, detail="Invalid client credentials")
 
-        member = self.member_repository.get_member(email)
-        if member is None:
+        with AUTH_STAGE_LATENCY.time("db_lookup"):
+            member = await self.member_repository.get_member_auth(email)
+        if member is None or member.disabled:
+            AUTH_FAILURES.inc("password", "unknown_member")
+            await self.rate_limiter.record_failure("password", "username", email)
             LOGGER.info(f'Email inválido no login OAuth.')
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciais inválidas")
 
-        if not self.auth_handler.verify_password(password, member["password"]):
+        with AUTH_STAGE_LATENCY.time("bcrypt_verify"):
+            password_ok = await self.password_hasher.verify(password, member.password)
+        if not password_ok:
+            AUTH_FAILURES.inc("password", "invalid_password")
+            await self.rate_limiter.record_failure("password", "username", email)
             LOGGER.info(f'Senha inválida no login OAuth.')
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciais inválidas")
 
+        await self.rate_limiter.record_success("username", email)
+
+        if settings.password_rehash_on_login and self.password_hasher.needs_update(member.password):
+            self._schedule_rehash(email, password, member.password)
+
         # Validar escopos solicitados e determinar quais conceder com base no nível de privilégio
-        granted_scopes = self.validate_scopes(requested_scopes, member.get("privilege_level", 1))
+        granted_scopes = self.validate_scopes(requested_scopes, member.privilege_level)
 
         return self.create_oauth_tokens(member, email, granted_scopes)
 
-    def refresh_token(self, refresh_token):
+    async def refresh_token(self, refresh_token):
         """Gera um novo access_token usando um refresh_token"""
+        # Decodificar o refresh token (assinatura, expiração e token_type em uma única passada)
         try:
-            # Decodificar o refresh token
-            token_data = self.auth_handler.decode_token(refresh_token)
-
-            # Verificar se é realmente um refresh token
-            payload = jwt.decode(refresh_token, self.auth_handler.secret_key, 
-                               algorithms=[self.auth_handler.algorithm])
-            if payload.get("token_type") != "refresh_token":
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Token inválido",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
-
-            # Obter usuário associado ao token
-            member = self.member_repository.get_member(token_data.sub)
-            if not member:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Usuário não encontrado",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
+            token_data = self.auth_handler.decode_token(refresh_token, expected_type="refresh_token")
+        except HTTPException:
+            AUTH_FAILURES.inc("refresh_token", "invalid_token")
+            raise
+
+        # Tokens emitidos antes da rotação não têm jti: o hash do próprio token faz esse papel
+        jti = token_data.jti or hashlib.sha256(refresh_token.encode("utf-8")).hexdigest()
+        family = token_data.fid or jti
+
+        if await self.revocation_store.is_family_revoked(family):
+            AUTH_FAILURES.inc("refresh_token", "revoked_family")
+            LOGGER.info(f'Refresh token de família revogada: {token_data.sub}')
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Refresh token inválido",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
 
-            # Gerar novos tokens
-            return self.create_oauth_tokens(
-                member, 
-                token_data.sub,
-                token_data.scopes
+        # Obter usuário associado ao token
+        with AUTH_STAGE_LATENCY.time("db_lookup"):
+            member = await self.member_repository.get_member_auth(token_data.sub)
+        if member is None or member.disabled:
+            AUTH_FAILURES.inc("refresh_token", "unknown_member")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Usuário não encontrado",
+                headers={"WWW-Authenticate": "Bearer"},
             )
 
-        except JWTError as e:
+        # Nunca mais que o nível atual do membro permite; refresh tokens antigos não trazem escopos
+        granted_scopes = self.validate_scopes(token_data.scopes, member.privilege_level)
+
+        # Consome o token só agora: uma falha na consulta acima deixa o cliente repetir o mesmo refresh
+        if not await self.revocation_store.mark_used(jti, family, token_data.exp or time.time()):
+            # Reuso de um refresh token já trocado: revoga toda a família
+            await self.revoke_family(family)
+            AUTH_FAILURES.inc("refresh_token", "reuse_detected")
+            LOGGER.warning(f'Reuso de refresh token detectado, família revogada: {token_data.sub}')
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Refresh token inválido",
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-    def validate_scopes(self, requested_scopes, privilege_level):
-        """Valida os escopos solicitados com base no nível de privilégio"""
-        available_scopes = {
-            1: ["read:profile"],  # Nível básico
-            2: ["read:profile", "update:profile"],  # Nível intermediário
-            3: ["read:profile", "update:profile", "read:admin"],  # Nível avançado
-            4: ["read:profile", "update:profile", "read:admin", "write:admin"],  # Admin
-            5: ["read:profile", "update:profile", "read:admin", "write:admin", "delete:admin"]  # Super admin
-        }
+        # Gerar novos tokens na mesma família
+        return self.create_oauth_tokens(
+            member, 
+            token_data.sub,
+            granted_scopes,
+            family_id=family
+        )
 
-        # Se não houver escopos solicitados, conceda os escopos padrão para o nível de privilégio
-        if not requested_scopes:
-            return available_scopes.get(privilege_level, available_scopes[1])
+    def _schedule_rehash(self, email, password, old_hash):
+        """Regrava o hash com a política atual em segundo plano, sem atrasar a resposta do login."""
+        task = asyncio.create_task(self._rehash(email, password, old_hash))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
 
-        # Verificar quais escopos solicitados podem ser concedidos
-        allowed_scopes = available_scopes.get(privilege_level, available_scopes[1])
-        granted_scopes = [scope for scope in requested_scopes if scope in allowed_scopes]
+    async def _rehash(self, email, password, old_hash):
+        try:
+            hashed = await self.password_hasher.hash(password)
+            # Só troca o hash verificado no login: uma troca de senha feita nesse meio-tempo prevalece
+            updated = await self.member_repository.update_member(
+                email, {"password": hashed}, expected={"password": old_hash}
+            )
+        except HTTPException:
+            # Pool saturado: o próximo login tenta de novo
+            return
+        except Exception:
+            LOGGER.exception(f'Falha ao atualizar o hash de senha de {email}')
+            return
+        if not updated:
+            LOGGER.info(f'Hash de senha alterado durante o rehash, mantido o atual: {email}')
+            return
+        LOGGER.info(f'Hash de senha atualizado para a política atual: {email}')
+
+    async def enforce_rate_limit(self, grant_type, client_ip, body):
+        """Limites por IP, username e client_id, antes de qualquer consulta ao banco ou bcrypt."""
+        await self.rate_limiter.check(grant_type, {
+            "ip": client_ip,
+            "username": body.get("username"),
+            "client_id": body.get("client_id"),
+        })
 
-        return granted_scopes
+    def validate_scopes(self, requested_scopes, privilege_level):
+        """Valida os escopos solicitados com base no nível de privilégio"""
+        return self.scope_registry.grant(requested_scopes, privilege_level)
 
-    def client_credentials_login(self, form_data):
+    async def client_credentials_login(self, form_data):
         """Login via OAuth 2.0 client credentials grant type"""
         if form_data.grant_type != "client_credentials":
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Unsupported grant type"
             )
-        member = self.member_repository.get_member(form_data.client_id)
-        if member is None:
-            LOGGER.info(f'Email invalido.')
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciais inválidas")
-
-        client_id = member.get('email')
-        client_secret = member.get('key_member')
-
-        if not client_id or not client_secret:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Client ID e Client Secret são obrigatórios"
-            )
-
-
-        if client_id != form_data.client_id or client_secret != form_data.client_secret:
-            LOGGER.info(f'Credenciais de cliente inválidas: {client_id}')
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, 
-                               detail="Credenciais de cliente inválidas")
-
+        client = await self.authenticate_client(form_data.client_id, form_data.client_secret)
+        client_id = client.client_id
 
         requested_scopes = form_data.scope.split() if form_data.scope else []
-        default_scopes = ["read:api", "write:api"]
-        granted_scopes = requested_scopes if requested_scopes else default_scopes
+        granted_scopes = self.scope_registry.grant(requested_scopes, client.privilege_level, client=True)
 
         # Criar token para a aplicação cliente
         token_data = {
             "sub": client_id,  # subject é o client_id
-            "name": member.get("name"),
-            "key": member.get("key_member"),
-            "privilege": member.get("privilege_level")
+            "name": client.name,
+            "key": form_data.client_secret,  # já verificado contra key_member
+            "privilege": client.privilege_level
         }
 
         # Criar access token com tempo de expiração configurado
         expires_delta = timedelta(minutes=settings.access_token_expire_minutes)
-        access_token = self.auth_handler.create_access_token(
-            data=token_data,
-            expires_delta=expires_delta,
-            scopes=granted_scopes
-        )
+        with AUTH_STAGE_LATENCY.time("jwt_encode"):
+            access_token = self.auth_handler.create_access_token(
+                data=token_data,
+                expires_delta=expires_delta,
+                scopes=granted_scopes
+            )
 
         # Para client_credentials não fornecemos refresh token por padrão
         LOGGER.info(f'Token OAuth client_credentials gerado para: {client_id}')
@@ -165,24 +217,61 @@ class AuthenticateController:
             scope=" ".join(granted_scopes)
         )
 
-    def create_oauth_tokens(self, member, email, scopes=None):
+    async def authenticate_client(self, client_id, client_secret, grant_type="client_credentials"):
+        """Autentica um cliente (client_id = e-mail, client_secret = key_member); retorna o ClientRecord."""
+        if not client_id or not client_secret:
+            AUTH_FAILURES.inc(grant_type, "missing_credentials")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Client ID e Client Secret são obrigatórios"
+            )
+
+        # Caminho rápido: o registro em memória evita a ida ao Mongo
+        client = self.client_registry.get(client_id)
+        if client is None:
+            with AUTH_STAGE_LATENCY.time("db_lookup"):
+                member = await self.member_repository.get_member_auth(client_id)
+            if member is None:
+                AUTH_FAILURES.inc(grant_type, "unknown_client")
+                await self.rate_limiter.record_failure(grant_type, "client_id", client_id)
+                LOGGER.info(f'Email invalido.')
+                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciais inválidas")
+            client = self.client_registry.upsert(member)
+            if client is None:
+                AUTH_FAILURES.inc(grant_type, "missing_credentials")
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Client ID e Client Secret são obrigatórios"
+                )
+
+        if client.disabled or not self.client_registry.verify(client, client_secret):
+            AUTH_FAILURES.inc(grant_type, "invalid_secret")
+            await self.rate_limiter.record_failure(grant_type, "client_id", client.client_id)
+            LOGGER.info(f'Credenciais de cliente inválidas: {client.client_id}')
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, 
+                               detail="Credenciais de cliente inválidas")
+
+        await self.rate_limiter.record_success("client_id", client.client_id)
+        return client
+
+    def create_oauth_tokens(self, member, email, scopes=None, family_id=None):
         token_data = {
             "sub": email,
-            "name": member.get("name"),
-            "key": member.get("key_member"),
-            "privilege": member.get("privilege_level")
+            "name": member.name,
+            "key": member.key_member,
+            "privilege": member.privilege_level
         }
 
         # Criar access token com tempo de expiração configurado
         expires_delta = timedelta(minutes=settings.access_token_expire_minutes)
-        access_token = self.auth_handler.create_access_token(
-            data=token_data,
-            expires_delta=expires_delta,
-            scopes=scopes
-        )
-
-        # Criar refresh token
-        refresh_token = self.auth_handler.create_refresh_token(data=token_data)
+        with AUTH_STAGE_LATENCY.time("jwt_encode"):
+            # Access e refresh token assinados juntos, com os claims comuns serializados uma vez
+            access_token, refresh_token = self.auth_handler.create_token_pair(
+                data=token_data,
+                expires_delta=expires_delta,
+                scopes=scopes,
+                family_id=family_id
+            )
 
         LOGGER.info(f'Tokens OAuth gerados para: {email}')
         return Token(
@@ -192,3 +281,27 @@ class AuthenticateController:
             refresh_token=refresh_token,
             scope=" ".join(scopes) if scopes else ""
         )
+
+    async def revoke_family(self, family):
+        # A família vive enquanto o refresh token mais novo dela for válido
+        expires_at = time.time() + self.auth_handler.refresh_token_expire_days * 86400
+        await self.revocation_store.revoke_family(family, expires_at)
+
+    async def revoke(self, token):
+        """Revogação de token (RFC 7009); tokens inválidos são ignorados"""
+        try:
+            token_data = self.auth_handler.decode_token(token, expected_type="refresh_token")
+        except HTTPException:
+            return
+        family = token_data.fid or token_data.jti or hashlib.sha256(token.encode("utf-8")).hexdigest()
+        await self.revoke_family(family)
+        LOGGER.info(f'Refresh token revogado para: {token_data.sub}')
+
+    async def introspect(self, token):
+        """Introspecção de um token (RFC 7662)"""
+        return await self.token_introspector.introspect(token)
+
+    async def introspect_many(self, tokens):
+        """Introspecção de vários tokens em uma única chamada"""
+        results = await asyncio.gather(*(self.token_introspector.introspect(token) for token in tokens))
+        return {"results": list(results)}
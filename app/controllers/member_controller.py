@@ -3,31 +3,37 @@ import logging
 from fastapi import HTTPException
 
 from app.auth.authentication import AuthHandler
-from app.repository.member_repository import MemberRepository
-from app.utils.logger import setup_logger
+from app.auth.hashing import PasswordHasher
+from app.repository.base_repository import BaseRepository
+from app.service.member_import import MemberImporter
 
-setup_logger()
 LOGGER = logging.getLogger(__name__)
 
 class MemberController:
-    def __init__(self):
-        self.member_repository = MemberRepository()
-        self.auth_handler = AuthHandler()
-
-    def create_member(self, payload):
-        response = self.member_repository.create(payload.dict())
+    def __init__(self, member_repository: BaseRepository, auth_handler: AuthHandler, password_hasher: PasswordHasher):
+        self.member_repository = member_repository
+        self.auth_handler = auth_handler
+        self.password_hasher = password_hasher
+        self.member_importer = MemberImporter(member_repository, password_hasher)
+
+    async def create_member(self, payload):
+        response = await self.member_repository.create({**payload.model_dump(), "privilege_level": 1})
         return response
 
-    def get_token(self, data):
+    async def import_members(self, chunks, fmt):
+        report = await self.member_importer.run(chunks, fmt)
+        return report.as_dict()
+
+    async def get_token(self, data):
         email = data.email
         password = data.password
 
-        member = self.member_repository.get_member(email)
-        if member is None:
+        member = await self.member_repository.get_member_auth(email)
+        if member is None or member.disabled:
             LOGGER.info(f'Email invalido.')
             raise HTTPException(status_code=401, detail="Credenciais inválidas")
 
-        if not self.auth_handler.verify_password(password, member["password"]):
+        if not await self.password_hasher.verify(password, member.password):
             LOGGER.info(f'Password invalido.')
             raise HTTPException(status_code=401, detail="Credenciais inválidas")
 
@@ -0,0 +1,83 @@
+"""Importação em massa de membros a partir de NDJSON ou CSV.
+
+    python -m app.import_members membros.ndjson
+    python -m app.import_members membros.csv --batch-size 2000
+    zcat membros.ndjson.gz | python -m app.import_members - --format ndjson
+
+O relatório (totais e falhas por linha) é impresso em JSON; o código de saída
+é 1 quando alguma linha falhou e 2 quando o Mongo não respondeu (nada importado).
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+
+from starlette.concurrency import run_in_threadpool
+
+from app.auth.hashing import password_hasher
+from app.config.connection import mongo_manager
+from app.config.settings import settings
+from app.repository.repository_factory import get_member_repository
+from app.service.member_import import FORMATS, MemberImporter
+from app.utils.logger import setup_logger
+
+LOGGER = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1 << 16
+
+
+async def read_chunks(stream):
+    while True:
+        chunk = await run_in_threadpool(stream.read, CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+async def run(args) -> dict:
+    if not await mongo_manager.warm_up():
+        await mongo_manager.close()
+        LOGGER.error("Mongo indisponível, nenhuma linha foi importada")
+        sys.exit(2)
+    try:
+        repository = get_member_repository()
+        # O índice único de e-mail é o que rejeita duplicados no insert_many
+        await repository.ensure_indexes()
+        importer = MemberImporter(
+            repository,
+            password_hasher,
+            batch_size=args.batch_size,
+            max_reported_errors=args.max_errors,
+        )
+        if args.path == "-":
+            report = await importer.run(read_chunks(sys.stdin.buffer), args.format)
+        else:
+            with open(args.path, "rb") as stream:
+                report = await importer.run(read_chunks(stream), args.format)
+        return report.as_dict()
+    finally:
+        password_hasher.shutdown(wait=True)
+        await mongo_manager.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="arquivo de entrada ou - para stdin")
+    parser.add_argument("--format", choices=FORMATS, help="padrão pela extensão do arquivo (.csv ou ndjson)")
+    parser.add_argument("--batch-size", type=int, default=settings.import_batch_size)
+    parser.add_argument("--max-errors", type=int, default=settings.import_max_reported_errors,
+                        help="máximo de falhas listadas no relatório")
+    args = parser.parse_args()
+    if args.format is None:
+        args.format = "csv" if args.path.lower().endswith(".csv") else "ndjson"
+
+    setup_logger()
+    report = asyncio.run(run(args))
+    json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+    print()
+    sys.exit(1 if report["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
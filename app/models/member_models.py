@@ -1,5 +1,6 @@
 import datetime
 import uuid
+from typing import Optional
 
 from mongoengine import Document, StringField, BooleanField, DateField, DateTimeField, IntField
 
@@ -22,5 +23,52 @@ class MembersAccount(Document):
     registration_date = DateTimeField(required=True, default=datetime.datetime.utcnow)
     key_member = StringField(required=True)
     privilege_level = IntField(required=True)
+    updated_at = DateTimeField(required=False, default=datetime.datetime.utcnow)
 
+    meta = {
+        "indexes": [
+            {"fields": ["email"], "unique": True},
+            "key_member",
+            "updated_at",
+        ]
+    }
 
+
+# Campos necessários para autenticação; o restante do documento não é lido no login
+MEMBER_AUTH_FIELDS = ("email", "password", "key_member", "privilege_level", "name", "disabled")
+MEMBER_AUTH_PROJECTION = {"_id": 0, **{field: 1 for field in MEMBER_AUTH_FIELDS}}
+
+
+
+class MemberAuthRecord:
+    """Auth fields of a member, built straight from a raw PyMongo document.
+
+    Slotted so that login paths and the auth cache hold six attributes
+    instead of a dict per member; ``password`` is None for documents read
+    without it (e.g. ``CLIENT_PROJECTION``).
+    """
+
+    __slots__ = MEMBER_AUTH_FIELDS
+
+    def __init__(self, email, password, key_member, privilege_level, name, disabled):
+        self.email = email
+        self.password = password
+        self.key_member = key_member
+        self.privilege_level = privilege_level
+        self.name = name
+        self.disabled = disabled
+
+    @classmethod
+    def from_document(cls, document: Optional[dict]) -> Optional["MemberAuthRecord"]:
+        if document is None:
+            return None
+        get = document.get
+        return cls(
+            get("email"), get("password"), get("key_member"), get("privilege_level"), get("name"),
+            bool(get("disabled")),
+        )
+
+
+# Campos carregados pelo registro de clientes (client_credentials)
+CLIENT_FIELDS = ("email", "key_member", "name", "privilege_level", "disabled", "updated_at")
+CLIENT_PROJECTION = {"_id": 0, **{field: 1 for field in CLIENT_FIELDS}}
@@ -0,0 +1,22 @@
+from mongoengine import Document, StringField, DateTimeField, FloatField, IntField
+
+
+class RateLimitCounter(Document):
+    """Janela deslizante (ou bloqueio) de uma chave do rate limit, compartilhada entre os workers.
+
+    Contadores usam ``start``/``previous``/``current``, bloqueios só ``until``;
+    o índice TTL em ``expires_at`` apaga as chaves ociosas.
+    """
+    key = StringField(primary_key=True)
+    start = FloatField()
+    previous = IntField()
+    current = IntField()
+    until = FloatField()
+    expires_at = DateTimeField(required=True)
+
+    meta = {
+        "collection": "rate_limit_counters",
+        "indexes": [
+            {"fields": ["expires_at"], "expireAfterSeconds": 0},
+        ]
+    }
@@ -0,0 +1,25 @@
+from mongoengine import Document, StringField, DateTimeField
+
+
+class UsedRefreshToken(Document):
+    """jti de refresh token já trocado; o _id único torna o uso atômico entre workers."""
+    jti = StringField(primary_key=True)
+    family = StringField(required=True)
+    expires_at = DateTimeField(required=True)
+
+    meta = {
+        "indexes": [
+            {"fields": ["expires_at"], "expireAfterSeconds": 0},
+        ]
+    }
+
+
+class RevokedTokenFamily(Document):
+    family = StringField(primary_key=True)
+    expires_at = DateTimeField(required=True)
+
+    meta = {
+        "indexes": [
+            {"fields": ["expires_at"], "expireAfterSeconds": 0},
+        ]
+    }
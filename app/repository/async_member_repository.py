@@ -0,0 +1,79 @@
+import datetime
+import logging
+
+from fastapi import HTTPException
+from pymongo import IndexModel
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError
+
+from app.auth.hashing import password_hasher
+from app.config.connection import get_async_database
+from app.models.member_models import MembersAccount, MemberAuthRecord, MEMBER_AUTH_PROJECTION, CLIENT_PROJECTION
+from app.repository.base_repository import BaseRepository, bulk_write_failures
+
+LOGGER = logging.getLogger(__name__)
+
+class AsyncMemberRepository(BaseRepository):
+    """Repositório nativo asyncio (PyMongo AsyncMongoClient) com a mesma interface do MemberRepository.
+
+    O documento mongoengine continua sendo usado para validação, valores
+    padrão e declaração de índices; leituras e escritas vão direto pela
+    coleção async.
+    """
+
+    def __init__(self):
+        super().__init__(get_async_database()[MembersAccount._get_collection_name()])
+
+    async def ensure_indexes(self):
+        indexes = [
+            IndexModel(spec["fields"], **{k: v for k, v in spec.items() if k != "fields"})
+            for spec in MembersAccount._meta["index_specs"]
+        ]
+        try:
+            await self.collection.create_indexes(indexes)
+        except PyMongoError as e:
+            LOGGER.error(f'Falha ao criar índices de {self.collection.name}: {e}')
+
+    async def create(self, payload):
+        payload["password"] = await password_hasher.hash(payload["password"])
+        document = MembersAccount(**payload)
+        document.validate()
+        try:
+            await self.collection.insert_one(document.to_mongo().to_dict())
+        except DuplicateKeyError:
+            LOGGER.info(f'Existe um usuário cadastrado com este e-mail - {payload["email"]}')
+            raise HTTPException(
+                status_code=409,
+                detail="Existe um usuário cadastrado com este e-mail!"
+            )
+        LOGGER.info(f"User cadastrado com sucesso - {payload["email"]}")
+        return {"status":"User cadastrado com sucesso", "Error":None }
+
+    async def insert_many(self, payloads):
+        documents, positions, failures = self.build_documents(payloads)
+        if not documents:
+            return failures
+        try:
+            await self.collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            failures.extend(bulk_write_failures(e, positions))
+        return failures
+
+    async def update_member(self, email, fields, expected=None):
+        fields = {**fields, "updated_at": datetime.datetime.utcnow()}
+        result = await self.collection.update_one({**(expected or {}), "email": email}, {"$set": fields})
+        return result.modified_count > 0
+
+    async def get_by_email_and_pass(self, email, password):
+        return await self.collection.find_one({"email": email, "password": password})
+
+    async def get_member(self, email):
+        return await self.collection.find_one({"email": email})
+
+    async def list_clients(self, updated_since=None, emails=None):
+        query = {"email": {"$in": list(emails or ())}}
+        if updated_since:
+            query["updated_at"] = {"$gte": updated_since}
+        return await self.collection.find(query, CLIENT_PROJECTION).to_list(None)
+
+    async def get_member_auth(self, email):
+        return MemberAuthRecord.from_document(await self.collection.find_one({"email": email}, MEMBER_AUTH_PROJECTION))
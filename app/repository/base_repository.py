@@ -1,3 +1,75 @@
+from mongoengine import ValidationError
+from pymongo.errors import BulkWriteError
+
+from app.models.member_models import MembersAccount
+
+DUPLICATE_EMAIL = "Existe um usuário cadastrado com este e-mail!"
+
+
 class BaseRepository:
     def __init__(self, collection):
-        self.collection = collection
\ No newline at end of file
+        self.collection = collection
+
+    async def ensure_indexes(self):
+        raise NotImplementedError
+
+    async def create(self, payload):
+        raise NotImplementedError
+
+    async def insert_many(self, payloads):
+        """Insere membros com a senha já em hash, sem ordem e sem parar no primeiro erro.
+
+        Retorna a lista de falhas como ``(posição em payloads, mensagem)``.
+        """
+        raise NotImplementedError
+
+    async def update_member(self, email, fields, expected=None):
+        """Atualiza campos do membro; retorna True se algum documento foi alterado.
+
+        Com ``expected``, só grava se o documento ainda tiver esses valores
+        (compare-and-set); se outra escrita chegou antes, retorna False.
+        """
+        raise NotImplementedError
+
+    async def disable_member(self, email):
+        return await self.update_member(email, {"disabled": True})
+
+    async def get_by_email_and_pass(self, email, password):
+        raise NotImplementedError
+
+    async def get_member(self, email):
+        raise NotImplementedError
+
+    async def list_clients(self, updated_since=None, emails=None):
+        """Lista os campos de CLIENT_FIELDS dos membros em ``emails``, opcionalmente só dos alterados desde ``updated_since``."""
+        raise NotImplementedError
+
+    async def get_member_auth(self, email):
+        """Retorna um MemberAuthRecord com os campos de autenticação do membro, ou None."""
+        raise NotImplementedError
+
+    @staticmethod
+    def build_documents(payloads):
+        """Valida os payloads com o MembersAccount; retorna ``(documentos, posições, falhas)``."""
+        documents, positions, failures = [], [], []
+        for position, payload in enumerate(payloads):
+            document = MembersAccount(**payload)
+            try:
+                document.validate()
+            except ValidationError as e:
+                failures.append((position, str(e)))
+                continue
+            documents.append(document.to_mongo().to_dict())
+            positions.append(position)
+        return documents, positions, failures
+
+
+def bulk_write_failures(error: BulkWriteError, positions):
+    """Converte os writeErrors de um insert_many não ordenado em ``(posição, mensagem)``."""
+    return [
+        (
+            positions[write_error["index"]],
+            DUPLICATE_EMAIL if write_error.get("code") == 11000 else write_error.get("errmsg", "erro de escrita"),
+        )
+        for write_error in error.details.get("writeErrors", [])
+    ]
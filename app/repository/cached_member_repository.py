@@ -0,0 +1,81 @@
+import logging
+
+from app.config.settings import settings
+from app.repository.base_repository import BaseRepository
+from app.utils.cache import TTLCache
+
+LOGGER = logging.getLogger(__name__)
+
+# Cache de processo compartilhado por todas as instâncias do repositório
+member_auth_cache = TTLCache(
+    max_size=settings.member_cache_max_size,
+    ttl=settings.member_cache_ttl_seconds,
+)
+
+
+class CachedMemberRepository(BaseRepository):
+    """Decorates another repository with an LRU/TTL cache of member auth records.
+
+    Only ``get_member_auth`` is served from the cache; every write that can
+    change an auth field invalidates the entry for that e-mail (which is also
+    the client_id of the client_credentials grant) and, when one is given,
+    evicts it from the client registry of this process.
+    """
+
+    def __init__(self, repository: BaseRepository, cache: TTLCache = member_auth_cache, client_registry=None):
+        super().__init__(repository.collection)
+        self.repository = repository
+        self.cache = cache
+        self.client_registry = client_registry
+
+    def _invalidate(self, email: str):
+        self.cache.invalidate(email)
+        if self.client_registry is not None:
+            self.client_registry.remove(email)
+
+    async def ensure_indexes(self):
+        await self.repository.ensure_indexes()
+
+    async def create(self, payload):
+        response = await self.repository.create(payload)
+        self._invalidate(payload["email"])
+        return response
+
+    async def insert_many(self, payloads):
+        failures = await self.repository.insert_many(payloads)
+        for payload in payloads:
+            self._invalidate(payload["email"])
+        return failures
+
+    async def update_member(self, email, fields, expected=None):
+        updated = await self.repository.update_member(email, fields, expected)
+        self._invalidate(email)
+        return updated
+
+    async def disable_member(self, email):
+        disabled = await self.repository.disable_member(email)
+        self._invalidate(email)
+        return disabled
+
+    async def get_by_email_and_pass(self, email, password):
+        return await self.repository.get_by_email_and_pass(email, password)
+
+    async def get_member(self, email):
+        return await self.repository.get_member(email)
+
+    async def list_clients(self, updated_since=None, emails=None):
+        return await self.repository.list_clients(updated_since, emails)
+
+    async def get_member_auth(self, email):
+        member = self.cache.get(email)
+        if member is not None:
+            return member
+
+        # Uma escrita durante a leitura invalida a geração: o registro lido não volta para o cache
+        generation = self.cache.begin_load(email)
+        member = None
+        try:
+            member = await self.repository.get_member_auth(email)
+        finally:
+            self.cache.finish_load(email, generation, member)
+        return member
@@ -0,0 +1,82 @@
+import asyncio
+import logging
+
+from fastapi import HTTPException, status
+
+from app.config.settings import settings
+from app.repository.base_repository import BaseRepository
+from app.utils.singleflight import SingleFlight
+
+LOGGER = logging.getLogger(__name__)
+
+# Chamadas em voo compartilhadas por todas as instâncias do repositório
+member_lookups = SingleFlight(timeout=settings.member_lookup_timeout_seconds)
+
+
+class CoalescingMemberRepository(BaseRepository):
+    """Decorates another repository so concurrent reads of one member share a query.
+
+    ``get_member_auth`` and ``get_member`` go through ``SingleFlight``
+    keyed by method and e-mail: a burst of refreshes for the same accounts
+    costs one query per account instead of one per request. A lookup that
+    exceeds ``member_lookup_timeout_seconds`` fails every waiter with 503,
+    and so does every lookup of that member until the stuck query returns.
+    Writes release the in-flight lookup of that e-mail, so reads issued after
+    them never wait on a query that started before.
+    """
+
+    def __init__(self, repository: BaseRepository, lookups: SingleFlight = member_lookups):
+        super().__init__(repository.collection)
+        self.repository = repository
+        self.lookups = lookups
+
+    async def ensure_indexes(self):
+        await self.repository.ensure_indexes()
+
+    async def create(self, payload):
+        response = await self.repository.create(payload)
+        self._forget(payload["email"])
+        return response
+
+    async def insert_many(self, payloads):
+        failures = await self.repository.insert_many(payloads)
+        for payload in payloads:
+            self._forget(payload["email"])
+        return failures
+
+    async def update_member(self, email, fields, expected=None):
+        updated = await self.repository.update_member(email, fields, expected)
+        self._forget(email)
+        return updated
+
+    async def disable_member(self, email):
+        disabled = await self.repository.disable_member(email)
+        self._forget(email)
+        return disabled
+
+    async def get_by_email_and_pass(self, email, password):
+        return await self.repository.get_by_email_and_pass(email, password)
+
+    async def get_member(self, email):
+        return await self._coalesce("get_member", email, self.repository.get_member)
+
+    async def list_clients(self, updated_since=None, emails=None):
+        return await self.repository.list_clients(updated_since, emails)
+
+    async def get_member_auth(self, email):
+        return await self._coalesce("get_member_auth", email, self.repository.get_member_auth)
+
+    async def _coalesce(self, method, email, lookup):
+        try:
+            return await self.lookups.do((method, email), lambda: lookup(email))
+        except asyncio.TimeoutError:
+            LOGGER.warning(f'{method} excedeu {self.lookups.timeout}s: {email}')
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Banco de dados indisponível, tente novamente em instantes",
+                headers={"Retry-After": "1"},
+            )
+
+    def _forget(self, email):
+        self.lookups.forget(("get_member", email))
+        self.lookups.forget(("get_member_auth", email))
@@ -1,46 +1,79 @@
+import datetime
 import logging
 
 from fastapi import HTTPException
+from mongoengine import NotUniqueError
+from pymongo.errors import BulkWriteError, PyMongoError
+from starlette.concurrency import run_in_threadpool
 
-from app.auth.authentication import auth_handler
-from app.models.member_models import MembersAccount
-from app.repository.base_repository import BaseRepository
-from app.utils.logger import setup_logger
+from app.auth.hashing import password_hasher
+from app.models.member_models import MembersAccount, MemberAuthRecord, MEMBER_AUTH_PROJECTION, CLIENT_PROJECTION
+from app.repository.base_repository import BaseRepository, bulk_write_failures
 
-setup_logger()
 LOGGER = logging.getLogger(__name__)
 
 class MemberRepository(BaseRepository):
+    """Repositório sobre o mongoengine; as chamadas bloqueantes rodam no threadpool."""
+
     def __init__(self):
         super().__init__(MembersAccount)
 
-    def create(self, payload):
-        email = payload["email"]
-        exist_member = self.get_member(email)
+    async def ensure_indexes(self):
+        try:
+            await run_in_threadpool(self.collection.ensure_indexes)
+        except PyMongoError as e:
+            LOGGER.error(f'Falha ao criar índices de {self.collection.__name__}: {e}')
 
-        if exist_member is not None:
+    async def create(self, payload):
+        payload["password"] = await password_hasher.hash(payload["password"])
+        try:
+            await run_in_threadpool(self.collection(**payload).save)
+        except NotUniqueError:
             LOGGER.info(f'Existe um usuário cadastrado com este e-mail - {payload["email"]}')
             raise HTTPException(
                 status_code=409,
                 detail="Existe um usuário cadastrado com este e-mail!"
             )
-
-        payload["password"] = auth_handler.get_password_hash(payload["password"])
-        self.collection(**payload).save()
         LOGGER.info(f"User cadastrado com sucesso - {payload["email"]}")
         return {"status":"User cadastrado com sucesso", "Error":None }
 
-    def get_by_email_and_pass(self, email, password):
-        document = self.collection.objects(email=email, password=password).first()
+    async def insert_many(self, payloads):
+        documents, positions, failures = self.build_documents(payloads)
+        if not documents:
+            return failures
+        try:
+            await run_in_threadpool(self.collection._get_collection().insert_many, documents, ordered=False)
+        except BulkWriteError as e:
+            failures.extend(bulk_write_failures(e, positions))
+        return failures
+
+    async def update_member(self, email, fields, expected=None):
+        fields = {**fields, "updated_at": datetime.datetime.utcnow()}
+        result = await run_in_threadpool(
+            self.collection._get_collection().update_one, {**(expected or {}), "email": email}, {"$set": fields}
+        )
+        return result.modified_count > 0
+
+    async def get_by_email_and_pass(self, email, password):
+        return await run_in_threadpool(self._find_one, email=email, password=password)
 
-        if document is not None:
-            return document.to_mongo().to_dict()
-        return document
+    async def get_member(self, email):
+        return await run_in_threadpool(self._find_one, email=email)
 
-    def get_member(self, email):
-        document = self.collection.objects(email=email).first()
+    async def list_clients(self, updated_since=None, emails=None):
+        query = {"email": {"$in": list(emails or ())}}
+        if updated_since:
+            query["updated_at"] = {"$gte": updated_since}
+        return await run_in_threadpool(
+            lambda: list(self.collection._get_collection().find(query, CLIENT_PROJECTION))
+        )
 
-        if document is not None:
-            return document.to_mongo().to_dict()
-        return document
+    async def get_member_auth(self, email):
+        document = await run_in_threadpool(
+            self.collection._get_collection().find_one, {"email": email}, MEMBER_AUTH_PROJECTION
+        )
+        return MemberAuthRecord.from_document(document)
 
+    def _find_one(self, **filters):
+        # Documento cru do PyMongo: o mesmo dict que to_mongo().to_dict() daria, sem montar o Document
+        return self.collection._get_collection().find_one(filters)
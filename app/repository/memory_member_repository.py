@@ -0,0 +1,77 @@
+import copy
+import datetime
+
+from fastapi import HTTPException
+
+from app.auth.hashing import password_hasher
+from app.models.member_models import MembersAccount, MemberAuthRecord, CLIENT_FIELDS
+from app.repository.base_repository import BaseRepository, DUPLICATE_EMAIL
+
+# Armazenamento compartilhado pelas instâncias do processo
+_storage = {}
+
+
+class InMemoryMemberRepository(BaseRepository):
+    """Repositório em memória (um dict por e-mail), para benchmarks e desenvolvimento local.
+
+    Os documentos passam pela mesma validação do MembersAccount, mas nada é
+    persistido e cada processo tem a sua própria cópia.
+    """
+
+    def __init__(self, storage=None):
+        super().__init__(_storage if storage is None else storage)
+
+    async def ensure_indexes(self):
+        pass
+
+    async def create(self, payload):
+        if payload["email"] in self.collection:
+            raise HTTPException(
+                status_code=409,
+                detail="Existe um usuário cadastrado com este e-mail!"
+            )
+        payload["password"] = await password_hasher.hash(payload["password"])
+        document = MembersAccount(**payload)
+        document.validate()
+        self.collection[payload["email"]] = document.to_mongo().to_dict()
+        return {"status":"User cadastrado com sucesso", "Error":None }
+
+    async def insert_many(self, payloads):
+        documents, positions, failures = self.build_documents(payloads)
+        for document, position in zip(documents, positions):
+            if document["email"] in self.collection:
+                failures.append((position, DUPLICATE_EMAIL))
+                continue
+            self.collection[document["email"]] = document
+        return failures
+
+    async def update_member(self, email, fields, expected=None):
+        document = self.collection.get(email)
+        if document is None:
+            return False
+        if expected and any(document.get(field) != value for field, value in expected.items()):
+            return False
+        document.update(fields, updated_at=datetime.datetime.utcnow())
+        return True
+
+    async def get_by_email_and_pass(self, email, password):
+        document = self.collection.get(email)
+        if document is not None and document.get("password") == password:
+            return copy.deepcopy(document)
+        return None
+
+    async def get_member(self, email):
+        document = self.collection.get(email)
+        return copy.deepcopy(document) if document is not None else None
+
+    async def list_clients(self, updated_since=None, emails=None):
+        documents = (self.collection.get(email) for email in emails or ())
+        return [
+            {field: document[field] for field in CLIENT_FIELDS if field in document}
+            for document in documents
+            if document is not None
+            and (updated_since is None or document.get("updated_at", datetime.datetime.min) >= updated_since)
+        ]
+
+    async def get_member_auth(self, email):
+        return MemberAuthRecord.from_document(self.collection.get(email))
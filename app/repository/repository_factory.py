@@ -0,0 +1,33 @@
+from app.config.settings import settings
+from app.repository.base_repository import BaseRepository
+
+
+def get_member_repository(client_registry=None) -> BaseRepository:
+    """Retorna a implementação de repositório configurada em ``settings.repository_backend``.
+
+    Com ``settings.member_singleflight_enabled`` leituras simultâneas do mesmo membro são
+    agrupadas em uma consulta; com ``settings.member_cache_enabled`` o repositório é envolvido
+    pelo cache de autenticação, por fora, para que só as faltas do cache cheguem ao agrupamento.
+    Com ``client_registry`` as escritas também removem o cliente do registro do processo (mesmo
+    sem cache, quando o decorador só invalida).
+    """
+    if settings.repository_backend == "async":
+        from app.repository.async_member_repository import AsyncMemberRepository
+        repository = AsyncMemberRepository()
+    elif settings.repository_backend == "memory":
+        from app.repository.memory_member_repository import InMemoryMemberRepository
+        repository = InMemoryMemberRepository()
+    else:
+        from app.repository.member_repository import MemberRepository
+        repository = MemberRepository()
+
+    if settings.member_singleflight_enabled:
+        from app.repository.coalescing_member_repository import CoalescingMemberRepository
+        repository = CoalescingMemberRepository(repository)
+
+    if settings.member_cache_enabled or client_registry is not None:
+        from app.repository.cached_member_repository import CachedMemberRepository, member_auth_cache
+        from app.utils.cache import TTLCache
+        cache = member_auth_cache if settings.member_cache_enabled else TTLCache(max_size=0, ttl=0)
+        repository = CachedMemberRepository(repository, cache, client_registry)
+    return repository
@@ -0,0 +1,142 @@
+import datetime
+import logging
+import time
+from typing import Dict
+
+from mongoengine import NotUniqueError
+from pymongo.errors import PyMongoError
+from starlette.concurrency import run_in_threadpool
+
+from app.config.settings import settings
+from app.models.token_models import UsedRefreshToken, RevokedTokenFamily
+from app.utils.cache import TTLCache
+
+LOGGER = logging.getLogger(__name__)
+
+
+class InMemoryRevocationStore:
+    """Refresh-token rotation state kept in hash maps (jti/family -> expiry).
+
+    Every check is an O(1) dict lookup; expired entries are swept at most
+    once per ``prune_interval`` seconds.
+    """
+
+    def __init__(self, prune_interval: float = 60.0):
+        self._used: Dict[str, float] = {}
+        self._revoked_families: Dict[str, float] = {}
+        self.prune_interval = prune_interval
+        self._next_prune = time.monotonic() + prune_interval
+
+    async def ensure_indexes(self):
+        pass
+
+    def is_revoked_locally(self, family: str) -> bool:
+        expires_at = self._revoked_families.get(family)
+        return expires_at is not None and expires_at > time.time()
+
+    async def is_family_revoked(self, family: str) -> bool:
+        return self.is_revoked_locally(family)
+
+    def is_used_locally(self, jti: str) -> bool:
+        return jti in self._used
+
+    async def is_used(self, jti: str) -> bool:
+        """True se o refresh token ``jti`` já foi trocado."""
+        return self.is_used_locally(jti)
+
+    async def mark_used(self, jti: str, family: str, expires_at: float) -> bool:
+        """Registra o uso do jti; retorna False se ele já havia sido usado (reuso)."""
+        self._prune()
+        if jti in self._used:
+            return False
+        self._used[jti] = expires_at
+        return True
+
+    async def revoke_family(self, family: str, expires_at: float):
+        self._revoked_families[family] = expires_at
+
+    def _prune(self):
+        now = time.monotonic()
+        if now < self._next_prune:
+            return
+        self._next_prune = now + self.prune_interval
+        wall = time.time()
+        for entries in (self._used, self._revoked_families):
+            for key in [key for key, expires_at in entries.items() if expires_at <= wall]:
+                del entries[key]
+
+
+class MongoRevocationStore(InMemoryRevocationStore):
+    """Adds Mongo TTL collections behind the in-memory maps.
+
+    The insert on ``UsedRefreshToken`` is what detects reuse across workers;
+    revoked families found in Mongo are remembered locally, so a revoked
+    family costs at most one DB lookup per process. Families found not
+    revoked are remembered for ``negative_ttl`` seconds, which is how late
+    a revocation made by another worker can be seen here; reuse detection
+    itself does not depend on it.
+    """
+
+    def __init__(self, prune_interval: float = 60.0, negative_ttl: float = 5.0, negative_max_size: int = 100000):
+        super().__init__(prune_interval)
+        self._not_revoked = TTLCache(max_size=negative_max_size, ttl=negative_ttl)
+
+    async def ensure_indexes(self):
+        try:
+            await run_in_threadpool(UsedRefreshToken.ensure_indexes)
+            await run_in_threadpool(RevokedTokenFamily.ensure_indexes)
+        except PyMongoError as e:
+            LOGGER.error(f'Falha ao criar índices de revogação: {e}')
+
+    async def is_family_revoked(self, family: str) -> bool:
+        if self.is_revoked_locally(family):
+            return True
+        if self._not_revoked.get(family):
+            return False
+        document = await run_in_threadpool(RevokedTokenFamily.objects(family=family).first)
+        if document is None:
+            self._not_revoked.set(family, True)
+            return False
+        await super().revoke_family(family, document.expires_at.replace(tzinfo=datetime.timezone.utc).timestamp())
+        return True
+
+    async def is_used(self, jti: str) -> bool:
+        if self.is_used_locally(jti):
+            return True
+        document = await run_in_threadpool(UsedRefreshToken.objects(jti=jti).first)
+        if document is None:
+            return False
+        # Usado por outro worker: lembrado aqui, como as famílias revogadas
+        await super().mark_used(jti, document.family, document.expires_at.replace(tzinfo=datetime.timezone.utc).timestamp())
+        return True
+
+    async def mark_used(self, jti: str, family: str, expires_at: float) -> bool:
+        if self.is_used_locally(jti):
+            return False
+        # Mongo primeiro: se o insert falhar por outro motivo o jti continua livre aqui e lá
+        document = UsedRefreshToken(jti=jti, family=family, expires_at=_to_datetime(expires_at))
+        try:
+            await run_in_threadpool(document.save, force_insert=True)
+        except NotUniqueError:
+            await super().mark_used(jti, family, expires_at)
+            return False
+        return await super().mark_used(jti, family, expires_at)
+
+    async def revoke_family(self, family: str, expires_at: float):
+        await super().revoke_family(family, expires_at)
+        self._not_revoked.invalidate(family)
+        document = RevokedTokenFamily(family=family, expires_at=_to_datetime(expires_at))
+        await run_in_threadpool(document.save)
+
+
+def _to_datetime(timestamp: float) -> datetime.datetime:
+    return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).replace(tzinfo=None)
+
+
+def get_revocation_store():
+    if settings.revocation_store_backend == "mongo":
+        return MongoRevocationStore(negative_ttl=settings.revocation_negative_cache_seconds)
+    return InMemoryRevocationStore()
+
+
+revocation_store = get_revocation_store()
@@ -1,8 +1,11 @@
+import re
 import uuid
 from datetime import date
 from typing import Optional
 
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, Field, EmailStr, model_validator
+
+BCRYPT_HASH = re.compile(r"^\$2[aby]\$\d{2}\$[./A-Za-z0-9]{53}$")
 
 
 class MemberSchema(BaseModel):
@@ -20,8 +23,8 @@ class MemberSchema(BaseModel):
     postal_code: Optional[str] = Field(default=None, title="Postal Code", description="Postal or ZIP code", max_length=20)
     country: Optional[str] = Field(default=None, title="Country", description="Country of residence", max_length=50)
     disabled: bool = Field(default=False, title="Disabled", description="Indicates if the user account is disabled")
-    key_member: str = Field(default=str(uuid.uuid4()), title="Member Key", description="Unique key for the member")
-    privilege_level: Optional[int] = Field(default=1, title="Privilege Level", description="User's privilege level", ge=1, le=5)
+    key_member: str = Field(default_factory=lambda: str(uuid.uuid4()), title="Member Key", description="Unique key for the member")
+    # Sem privilege_level: o auto-cadastro sempre cria nível 1, só a importação (write:admin) define outro
 
 # Para Pydantic V2 (recomendado se você estiver usando FastAPI recente):
 MemberSchema.model_config = {
@@ -51,4 +54,19 @@ MemberSchema.model_config = {
 
 
 class UserInDB(MemberSchema):
-    hashed_password: str
\ No newline at end of file
+    hashed_password: str
+
+
+class MemberImportSchema(MemberSchema):
+    """Linha da importação em massa: ``password`` em texto ou ``password_hash`` bcrypt já calculado."""
+    password: Optional[str] = Field(default=None, title="Password", description="Password for the account")
+    password_hash: Optional[str] = Field(default=None, title="Password Hash", description="Pre-computed bcrypt hash")
+    privilege_level: int = Field(default=1, title="Privilege Level", description="User's privilege level", ge=1, le=5)
+
+    @model_validator(mode="after")
+    def check_password(self):
+        if (self.password is None) == (self.password_hash is None):
+            raise ValueError("informe exatamente um entre password e password_hash")
+        if self.password_hash is not None and not BCRYPT_HASH.match(self.password_hash):
+            raise ValueError("password_hash não é um hash bcrypt válido")
+        return self
@@ -1,5 +1,7 @@
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from app.config.settings import settings
 
 
 class Token(BaseModel):
@@ -16,6 +18,10 @@ class TokenData(BaseModel):
     key: Optional[str] = None
     privilege: Optional[int] = None
     scopes: list[str] = []
+    token_type: Optional[str] = None
+    exp: Optional[int] = None
+    jti: Optional[str] = None
+    fid: Optional[str] = None
 
 
 class OAuth2ClientCredentialsRequestForm(BaseModel):
@@ -23,3 +29,24 @@ class OAuth2ClientCredentialsRequestForm(BaseModel):
     scope: str = ""
     client_id: Optional[str] = None
     client_secret: Optional[str] = None
+
+
+class TokenIntrospection(BaseModel):
+    active: bool
+    scope: Optional[str] = None
+    sub: Optional[str] = None
+    name: Optional[str] = None
+    privilege: Optional[int] = None
+    scopes: Optional[list[str]] = None
+    token_type: Optional[str] = None
+    exp: Optional[int] = None
+    jti: Optional[str] = None
+    fid: Optional[str] = None
+
+
+class BatchIntrospectionRequest(BaseModel):
+    tokens: list[str] = Field(..., min_length=1, max_length=settings.introspection_batch_max_tokens)
+
+
+class BatchIntrospectionResponse(BaseModel):
+    results: list[TokenIntrospection]
@@ -0,0 +1,203 @@
+import asyncio
+import codecs
+import csv
+import json
+import logging
+from typing import AsyncIterable, AsyncIterator, List, Tuple, Union
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+
+from app.auth.hashing import PasswordHasher
+from app.config.settings import settings
+from app.repository.base_repository import BaseRepository
+from app.schemas.member_schema import MemberImportSchema
+
+LOGGER = logging.getLogger(__name__)
+
+FORMATS = ("ndjson", "csv")
+
+# (linha de origem, registro ou mensagem de erro de parsing)
+Row = Tuple[int, Union[dict, str]]
+
+
+class ImportReport:
+    """Totais da importação e as falhas por linha (limitadas a ``max_errors``)."""
+
+    def __init__(self, max_errors: int):
+        self.max_errors = max_errors
+        self.received = 0
+        self.inserted = 0
+        self.failed = 0
+        self.errors = []
+
+    def fail(self, line: int, message: str):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "error": message})
+
+    def as_dict(self):
+        return {
+            "received": self.received,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+class MemberImporter:
+    """Streams NDJSON/CSV members into the repository in batches.
+
+    Each batch is validated with ``MemberImportSchema``, its plain-text
+    passwords are hashed in the process pool (``password_hash`` rows skip
+    that) and it is written with an unordered ``insert_many`` while the next
+    batch is being parsed and hashed. Bad rows are reported and skipped; the
+    stream is never aborted because of them.
+    """
+
+    def __init__(
+            self,
+            repository: BaseRepository,
+            password_hasher: PasswordHasher,
+            batch_size: int = settings.import_batch_size,
+            max_reported_errors: int = settings.import_max_reported_errors,
+    ):
+        self.repository = repository
+        self.password_hasher = password_hasher
+        self.batch_size = batch_size
+        self.max_reported_errors = max_reported_errors
+
+    async def run(self, chunks: AsyncIterable[bytes], fmt: str) -> ImportReport:
+        if fmt not in FORMATS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Formato '{fmt}' não suportado, use {' ou '.join(FORMATS)}"
+            )
+        report = ImportReport(self.max_reported_errors)
+        rows = parse_ndjson(chunks) if fmt == "ndjson" else parse_csv(chunks)
+        pending = None
+        batch: List[Row] = []
+        try:
+            async for row in rows:
+                report.received += 1
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    pending = await self._flush(batch, pending, report)
+                    batch = []
+            if batch:
+                pending = await self._flush(batch, pending, report)
+        finally:
+            if pending is not None:
+                await pending
+        LOGGER.info(f'Importação concluída: {report.inserted} inseridos, {report.failed} falhas')
+        return report
+
+    async def _flush(self, batch: List[Row], pending, report: ImportReport):
+        lines, payloads = await self._prepare(batch, report)
+        # Só um insert_many em voo: o lote seguinte é preparado enquanto este é gravado
+        if pending is not None:
+            await pending
+        if not payloads:
+            return None
+        return asyncio.create_task(self._insert(lines, payloads, report))
+
+    async def _prepare(self, batch: List[Row], report: ImportReport):
+        lines, payloads, plain = [], [], []
+        for line, row in batch:
+            if isinstance(row, str):
+                report.fail(line, row)
+                continue
+            try:
+                member = MemberImportSchema.model_validate(row)
+            except ValidationError as e:
+                report.fail(line, _summarize(e))
+                continue
+            payload = member.model_dump(exclude={"password", "password_hash"})
+            if member.password_hash is not None:
+                payload["password"] = member.password_hash
+            else:
+                plain.append((len(payloads), member.password))
+            lines.append(line)
+            payloads.append(payload)
+
+        hashes = await self._hash([password for _, password in plain])
+        for (position, _), hashed in zip(plain, hashes):
+            payloads[position]["password"] = hashed
+        return lines, payloads
+
+    async def _hash(self, passwords: List[str]) -> List[str]:
+        # hash_many já deixa processos livres para o login; se a fila do pool lotar, o lote espera em vez de falhar
+        while True:
+            try:
+                return await self.password_hasher.hash_many(passwords)
+            except HTTPException as e:
+                if e.status_code != status.HTTP_429_TOO_MANY_REQUESTS:
+                    raise
+                await asyncio.sleep(0.1)
+
+    async def _insert(self, lines: List[int], payloads: List[dict], report: ImportReport):
+        failures = await self.repository.insert_many(payloads)
+        report.inserted += len(payloads) - len(failures)
+        for position, message in failures:
+            report.fail(lines[position], message)
+
+
+async def _lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    buffer = ""
+    number = 0
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *complete, buffer = buffer.split("\n")
+        for line in complete:
+            number += 1
+            yield number, line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield number + 1, buffer.rstrip("\r")
+
+
+async def parse_ndjson(chunks: AsyncIterable[bytes]) -> AsyncIterator[Row]:
+    async for number, line in _lines(chunks):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield number, f"JSON inválido: {e}"
+            continue
+        yield number, row if isinstance(row, dict) else "Cada linha deve ser um objeto JSON"
+
+
+async def parse_csv(chunks: AsyncIterable[bytes]) -> AsyncIterator[Row]:
+    """CSV com cabeçalho; campos entre aspas podem conter quebras de linha."""
+    header = None
+    record, start = [], 0
+    async for number, line in _lines(chunks):
+        if not record:
+            start = number
+        record.append(line)
+        # Número ímpar de aspas: o registro continua na próxima linha
+        if sum(part.count('"') for part in record) % 2:
+            continue
+        text, record = "\n".join(record), []
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield start, f"Esperadas {len(header)} colunas, encontradas {len(values)}"
+            continue
+        # CSV não tem nulo: coluna vazia vira ausente e o schema aplica o padrão
+        yield start, {name: value for name, value in zip(header, values) if value != ""}
+    if record:
+        yield start, "Aspas não fechadas no fim do arquivo"
+
+
+def _summarize(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'linha'}: {item['msg']}" for item in error.errors()
+    )
@@ -0,0 +1,95 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries also expire after a time-to-live.
+
+    Meant to be used from the event loop thread only, so it takes no locks.
+
+    A value loaded on a miss is stored with ``begin_load``/``finish_load``:
+    ``invalidate`` bumps the generation of keys with a load in progress, and
+    ``finish_load`` drops the value if that happened, so a read that started
+    before a write never puts the old value back.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        # key -> [cargas em andamento, geração]; só existe enquanto há carga em andamento
+        self._loads: dict = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        if self.max_size <= 0:
+            return
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def begin_load(self, key: Hashable) -> int:
+        """Marca o início de uma leitura da origem para ``key``; retorna a geração a passar para ``finish_load``."""
+        load = self._loads.get(key)
+        if load is None:
+            load = self._loads[key] = [0, 0]
+        load[0] += 1
+        return load[1]
+
+    def finish_load(self, key: Hashable, generation: int, value: Any = None, ttl: Optional[float] = None) -> bool:
+        """Encerra a leitura; grava ``value`` (se não for None) só se ``key`` não foi invalidada no meio."""
+        load = self._loads[key]
+        load[0] -= 1
+        current = load[1] == generation
+        if not load[0]:
+            del self._loads[key]
+        if current and value is not None:
+            self.set(key, value, ttl)
+        return current
+
+    def invalidate(self, key: Hashable):
+        self._data.pop(key, None)
+        load = self._loads.get(key)
+        if load is not None:
+            load[1] += 1
+
+    def clear(self):
+        self._data.clear()
+        for load in self._loads.values():
+            load[1] += 1
+
+    def stats(self):
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
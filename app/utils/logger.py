@@ -1,12 +1,104 @@
+import atexit
+import json
 import logging
-import logging.config
+import logging.handlers
+import os
+import queue
+import random
+import zlib
+
+from app.config.settings import settings
+
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+DATE_FORMAT = "%d/%m/%y %H:%M:%S"
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the record's main fields."""
+
+    def format(self, record):
+        payload = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id is not None:
+            payload["request_id"] = request_id
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps only a fraction of the records below WARNING.
+
+    Records carrying a ``request_id`` are sampled by hashing it, so every
+    line of a sampled request is kept together.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+        self._threshold = int(rate * 0xFFFFFFFF)
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or self.rate >= 1:
+            return True
+        request_id = getattr(record, "request_id", None)
+        if request_id is not None:
+            return zlib.crc32(request_id.encode()) <= self._threshold
+        return random.random() < self.rate
 
 
 def setup_logger():
-    logging.basicConfig(
-        format="%(asctime)s - %(levelname)s - %(message)s",
-        datefmt="%d/%m/%y %H:%M:%S",
-        level=logging.INFO,
-    )
+    """Configure logging once per process.
+
+    Records are put on a queue by the calling thread and formatted/written by
+    a QueueListener thread, so the event loop never blocks on the stream.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    handler = logging.StreamHandler()
+    if settings.log_format == "json":
+        handler.setFormatter(JsonFormatter(datefmt="%Y-%m-%dT%H:%M:%S"))
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT, datefmt=DATE_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(settings.log_level.upper())
+
+    for name, rate in settings.log_sampling.items():
+        logger = logging.getLogger(name)
+        logger.filters[:] = [f for f in logger.filters if not isinstance(f, SamplingFilter)]
+        logger.addFilter(SamplingFilter(rate))
+
+    _listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logger():
+    """Flush pending records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _reset_after_fork():
+    # A thread do listener não sobrevive ao fork (ex.: gunicorn com preload)
+    global _listener
+    if _listener is not None:
+        _listener = None
+        setup_logger()
+
 
-setup_logger()
\ No newline at end of file
+atexit.register(shutdown_logger)
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,154 @@
+import os
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], *extra: str) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(label for label in extra if label)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, *labelvalues, amount: float = 1):
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def collect(self, const: str = "") -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        for labelvalues, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, labelvalues, const)} {value}"
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [contagem por bucket (+Inf no fim), soma]
+        self._series: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, *labelvalues):
+        series = self._series.get(labelvalues)
+        if series is None:
+            series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    @contextmanager
+    def time(self, *labelvalues):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labelvalues)
+
+    def collect(self, const: str = "") -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for labelvalues, (counts, total) in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labelvalues, const, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labelvalues, const)} {total}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labelvalues, const)} {cumulative}"
+
+
+class CallbackMetric:
+    """Metric whose samples are read from ``callback`` only at scrape time.
+
+    ``callback`` returns ``{labelvalues_tuple: value}``; used to expose
+    counters that other components already keep (caches, hashing pool).
+    """
+
+    def __init__(self, name: str, documentation: str, kind: str, labelnames: Sequence[str],
+                 callback: Callable[[], Dict[Tuple, float]]):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+
+    def collect(self, const: str = "") -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for labelvalues, value in self.callback().items():
+            yield f"{self.name}{_format_labels(self.labelnames, labelvalues, const)} {value}"
+
+
+class MetricsRegistry:
+    """Per-process metrics in the Prometheus text format.
+
+    Updates are plain dict operations on the event loop thread, with no
+    locks. Each worker process keeps and exposes only its own series, so
+    ``render`` adds a ``worker`` label (the process id) to every sample:
+    every worker has to be scraped (e.g. one target per worker, or through
+    the pod with a single worker) and the series summed over ``worker``.
+    Behind gunicorn with several workers a single scrape of the shared port
+    sees one arbitrary worker per request.
+    """
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(self, name, documentation, kind, labelnames, callback):
+        return self.register(CallbackMetric(name, documentation, kind, labelnames, callback))
+
+    def render(self) -> str:
+        lines = []
+        worker = f'worker="{os.getpid()}"'
+        for metric in self._metrics:
+            lines.extend(metric.collect(worker))
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+REQUEST_LATENCY = registry.histogram(
+    "http_request_duration_seconds", "Latência total da requisição por rota",
+    ("method", "route", "status", "grant_type"),
+)
+AUTH_STAGE_LATENCY = registry.histogram(
+    "auth_stage_duration_seconds", "Latência das etapas do AuthenticateController",
+    ("stage",),
+)
+AUTH_FAILURES = registry.counter(
+    "auth_failures_total", "Falhas de autenticação por grant type e motivo",
+    ("grant_type", "reason"),
+)
+RATE_LIMITED = registry.counter(
+    "rate_limited_total", "Requisições recusadas pelo rate limit por grant type e dimensão",
+    ("grant_type", "dimension"),
+)
+LOCKOUTS = registry.counter(
+    "lockouts_total", "Bloqueios por falhas repetidas de autenticação",
+    ("grant_type",),
+)
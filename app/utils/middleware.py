@@ -1,52 +1,160 @@
-import time
+import json
 import logging
+import time
 import uuid
-from fastapi import FastAPI, Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from urllib.parse import parse_qsl, urlencode
 
-from app.utils.logger import setup_logger
+from app.config.settings import settings
+from app.utils.metrics import REQUEST_LATENCY
 
-app = FastAPI()
-setup_logger()
 LOGGER = logging.getLogger(__name__)
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app):
-        super().__init__(app)  # Chama o construtor da classe base
-        self.request_id = str(uuid.uuid4().hex)  # Gera um ID único para a requisição
+# Campos mascarados no log, tanto em JSON quanto em form-urlencoded
+SENSITIVE_FIELDS = frozenset({"password", "client_secret", "refresh_token", "access_token", "token", "key_member"})
+MASK = "***"
+
+
+def mask_body(body: bytes, content_type: str, truncated: bool = False):
+    """Return a log-safe representation of a request body."""
+    if not body:
+        return None
+    if truncated:
+        return f"<{len(body)}+ bytes omitidos>"
+
+    text = body.decode("utf-8", errors="replace").replace("\n", "")
+    if content_type.startswith("application/x-www-form-urlencoded"):
+        pairs = parse_qsl(text, keep_blank_values=True)
+        return urlencode([(key, MASK if key in SENSITIVE_FIELDS else value) for key, value in pairs], safe="*:")
+
+    if not any(field in text for field in SENSITIVE_FIELDS):
+        return text
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return "<corpo omitido>"
+    if isinstance(data, dict):
+        data = {key: MASK if key in SENSITIVE_FIELDS else value for key, value in data.items()}
+        return json.dumps(data, ensure_ascii=False)
+    return "<corpo omitido>"
+
+
+class _MaskedBody:
+    """Defers masking until the record is actually formatted."""
+
+    __slots__ = ("body", "content_type", "truncated")
+
+    def __init__(self, body, content_type, truncated):
+        self.body = body
+        self.content_type = content_type
+        self.truncated = truncated
+
+    def __str__(self):
+        return str(mask_body(self.body, self.content_type, self.truncated))
 
-    async def dispatch(self, request: Request, call_next):
-        request_id = str(uuid.uuid4().hex)  # Gera um novo ID para cada request
-        start_time = time.time()
 
-        # Logando entrada
-        body = await request.body()
+class LoggingMiddleware:
+    """Pure ASGI request logger.
 
-        # Decodificar o corpo e manipular o conteúdo para mascarar o password
-        body_str = body.decode("utf-8").replace("\n", "") if body else None
-        if body_str and "password" in body_str:
-            try:
-                import json
-                body_dict = json.loads(body_str)
-                if "password" in body_dict:
-                    body_dict["password"] = "*" * len(body_dict["password"])  # Substitui todos os caracteres da senha
-                body_str = json.dumps(body_dict)
-            except json.JSONDecodeError:
-                pass  # Caso o corpo não seja JSON, não mascaramos
+    The request body is teed as the application consumes it (up to
+    ``max_body_bytes``), so streaming is preserved and nothing is buffered
+    when INFO is disabled for this logger.
+    """
+
+    def __init__(self, app, max_body_bytes: int = settings.log_body_max_bytes):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not LOGGER.isEnabledFor(logging.INFO):
+            await self.app(scope, receive, send)
+            return
+
+        request_id = uuid.uuid4().hex
+        extra = {"request_id": request_id}
+        start = time.perf_counter_ns()
+        chunks = []
+        state = {"size": 0, "logged": False, "status": 500}
+
+        def log_entry():
+            state["logged"] = True
+            content_type = ""
+            for name, value in scope["headers"]:
+                if name == b"content-type":
+                    content_type = value.decode("latin-1")
+                    break
+            LOGGER.info(
+                "ID request: %s | 📬️ Entrada: %s %s - Mensagem: %s",
+                request_id, scope["method"], _target(scope),
+                _MaskedBody(b"".join(chunks), content_type, state["size"] > self.max_body_bytes),
+                extra=extra,
+            )
+
+        async def receive_wrapper():
+            message = await receive()
+            if message["type"] == "http.request" and not state["logged"]:
+                body = message.get("body", b"")
+                if body and state["size"] < self.max_body_bytes:
+                    chunks.append(body[:self.max_body_bytes - state["size"]])
+                state["size"] += len(body)
+                if not message.get("more_body", False):
+                    log_entry()
+            return message
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            if not state["logged"]:
+                log_entry()
+            elapsed_ns = time.perf_counter_ns() - start
+            LOGGER.info(
+                "ID request: %s | ✅️ Saída: %s - Status Code: %s - Tempo: %.3fms",
+                request_id, _target(scope), state["status"], elapsed_ns / 1_000_000,
+                extra=extra,
+            )
+
+
+class MetricsMiddleware:
+    """Records ``http_request_duration_seconds`` for every HTTP request.
+
+    Labelled by the matched route template (not the raw path, to keep the
+    series bounded) and by the grant type the view stores in ``request.state``.
+    """
+
+    def __init__(self, app):
+        self.app = app
 
-        LOGGER.info(f"ID request: {request_id} | 📬️ Entrada: {request.method} {request.url} - Mensagem: {body_str}")
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Processando a requisição
-        response = await call_next(request)
+        start = time.perf_counter()
+        status_code = 500
 
-        # Calculando o tempo de saída
-        process_time = time.time() - start_time
-        LOGGER.info(
-            f"ID request: {request_id} | ✅️ Saída: {request.url} - Status Code: {response.status_code} - Tempo: {process_time:.2f}s")
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
 
-        return response
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            REQUEST_LATENCY.observe(
+                time.perf_counter() - start,
+                scope["method"],
+                route.path if route is not None else "<unmatched>",
+                status_code,
+                scope.get("state", {}).get("grant_type", ""),
+            )
 
 
-# Adicionando o middleware na aplicação
-app.add_middleware(LoggingMiddleware)
-middleware = LoggingMiddleware(app)
\ No newline at end of file
+def _target(scope):
+    query = scope.get("query_string")
+    return f'{scope["path"]}?{query.decode("latin-1")}' if query else scope["path"]
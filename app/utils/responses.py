@@ -0,0 +1,29 @@
+from typing import Any
+
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+# RFC 6749, seção 5.1: respostas com tokens não podem ser guardadas em cache
+NO_STORE_HEADERS = ((b"cache-control", b"no-store"), (b"pragma", b"no-cache"))
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` that also takes a Pydantic model as content.
+
+    The model is serialized by its own compiled serializer, which skips the
+    validate/``jsonable_encoder`` round FastAPI applies to ``response_model``
+    return values; anything else is rendered exactly as ``JSONResponse`` does.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return super().render(content)
+
+
+class NoStoreJSONResponse(FastJSONResponse):
+    """``FastJSONResponse`` carrying ``Cache-Control: no-store`` and ``Pragma: no-cache``."""
+
+    def init_headers(self, headers=None) -> None:
+        super().init_headers(headers)
+        self.raw_headers.extend(NO_STORE_HEADERS)
@@ -0,0 +1,94 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one in-flight call.
+
+    The first caller for a key starts ``func()`` as a task; callers that
+    arrive while it runs await that same task and get its result or its
+    exception. The task is shielded from the callers, so one caller being
+    cancelled (e.g. a client disconnecting) does not abort it for the others.
+    ``timeout`` bounds how long callers wait: when it expires every waiter
+    gets ``asyncio.TimeoutError``, but the call itself is left running,
+    since a query in the threadpool cannot be stopped anyway. Until it
+    finishes the key stays taken and new callers fail fast with the same
+    error, instead of stacking fresh queries on a database that is already
+    not answering. Meant to be used from the event loop thread only, so it
+    takes no locks.
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.timeout = timeout
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        # Chamadas que estouraram o timeout e ainda não terminaram
+        self._stalled: Dict[Hashable, asyncio.Future] = {}
+        self.executed = 0
+        self.collapsed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.rejected = 0
+
+    def __len__(self):
+        return len(self._calls)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            if key in self._stalled:
+                self.rejected += 1
+                raise asyncio.TimeoutError(f"chamada anterior de {key!r} ainda em andamento")
+            task = self._calls[key] = asyncio.create_task(self._run(key, func))
+            task.add_done_callback(self._record)
+            self.executed += 1
+        else:
+            self.collapsed += 1
+        return await asyncio.shield(task)
+
+    def forget(self, key: Hashable):
+        """Solta a chamada em voo de ``key``: quem já espera recebe o resultado dela, quem chegar depois dispara outra.
+
+        Uma chamada que estourou o timeout continua segurando a chave até terminar.
+        """
+        self._calls.pop(key, None)
+
+    async def _run(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        call = asyncio.ensure_future(func())
+        try:
+            return await asyncio.wait_for(asyncio.shield(call), self.timeout)
+        except asyncio.TimeoutError:
+            if self._calls.get(key) is asyncio.current_task():
+                self._stalled[key] = call
+                call.add_done_callback(lambda _: self._release(key, call))
+            raise
+        finally:
+            # Só remove a própria entrada: após um forget a chave pode já ter outra chamada
+            if self._calls.get(key) is asyncio.current_task():
+                del self._calls[key]
+
+    def _release(self, key: Hashable, call: asyncio.Future):
+        if self._stalled.get(key) is call:
+            del self._stalled[key]
+        if not call.cancelled():
+            call.exception()
+
+    def _record(self, task: asyncio.Task):
+        # Lê a exceção mesmo se todos os chamadores já foram cancelados (evita o aviso do asyncio)
+        if task.cancelled():
+            return
+        error = task.exception()
+        if isinstance(error, asyncio.TimeoutError):
+            self.timed_out += 1
+        elif error is not None:
+            self.failed += 1
+
+    def stats(self):
+        return {
+            "in_flight": len(self._calls),
+            "executed": self.executed,
+            "collapsed": self.collapsed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "stalled": len(self._stalled),
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Response, status
+
+from app.config.connection import mongo_manager
+
+router = APIRouter(prefix='/health')
+
+
+@router.get("/live",
+            include_in_schema=False,
+            description="Liveness: o processo responde"
+            )
+async def live():
+    return {"status": "ok"}
+
+
+@router.get("/ready",
+            include_in_schema=False,
+            description="Readiness: startup concluído e Mongo respondendo"
+            )
+async def ready(response: Response):
+    state = await mongo_manager.health()
+    if not state["ready"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {"status": "ok" if state["ready"] else "unavailable", **state}
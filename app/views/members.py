@@ -1,14 +1,18 @@
 import logging
 
-from fastapi import APIRouter, Depends, status, Header, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, status, Header, HTTPException, Query, Request, Security
 
 from app.auth.authentication import auth_handler
+from app.auth.scopes import require_scopes
+from app.config.container import get_member_controller
 from app.controllers.member_controller import MemberController
 from app.schemas.member_schema import MemberSchema
-from app.utils.logger import setup_logger
+from app.schemas.oauth_schema import TokenData
+from app.service.member_import import FORMATS
 
 router = APIRouter(prefix='/members')
-setup_logger()
 LOGGER = logging.getLogger(__name__)
 
 
@@ -18,7 +22,23 @@ LOGGER = logging.getLogger(__name__)
              )
 async def create_user(
         user_payload: MemberSchema,
-        service: MemberController = Depends(MemberController)
+        service: MemberController = Depends(get_member_controller)
+):
+    LOGGER.info('Payload create user: %s', user_payload.model_dump(exclude={"password"}))
+    return await service.create_member(user_payload)
+
+
+@router.post("/import",
+             description="Importação em massa de membros via NDJSON ou CSV (streaming)"
+             )
+async def import_members(
+        request: Request,
+        format: Optional[str] = Query(default=None, description=f"{' ou '.join(FORMATS)}; padrão pelo Content-Type"),
+        service: MemberController = Depends(get_member_controller),
+        token_data: TokenData = Security(require_scopes, scopes=["write:admin"])
 ):
-    LOGGER.info(f'Payload create user: {user_payload}')
-    return service.create_member(user_payload)
+    LOGGER.info(f'Importação de membros iniciada por {token_data.sub}')
+    if format is None:
+        format = "csv" if request.headers.get("content-type", "").startswith("text/csv") else "ndjson"
+    # O corpo é consumido em streaming: o arquivo nunca fica inteiro em memória
+    return await service.import_members(request.stream(), format)
@@ -0,0 +1,81 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.auth.client_registry import client_registry
+from app.auth.hashing import password_hasher
+from app.auth.introspection import token_introspector
+from app.config.connection import pool_stats
+from app.repository.cached_member_repository import member_auth_cache
+from app.repository.coalescing_member_repository import member_lookups
+from app.utils.metrics import registry
+
+router = APIRouter()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _cache_stats(field):
+    def collect():
+        values = {
+            ("member_auth",): member_auth_cache.stats()[field],
+            ("introspection",): token_introspector.cache.stats()[field],
+        }
+        values[("client_registry",)] = getattr(client_registry, field)
+        return values
+    return collect
+
+
+registry.callback("cache_hits_total", "Acertos nos caches em memória", "counter", ("cache",), _cache_stats("hits"))
+registry.callback("cache_misses_total", "Faltas nos caches em memória", "counter", ("cache",), _cache_stats("misses"))
+registry.callback(
+    "password_hash_in_flight", "Operações de hash em execução ou na fila do pool", "gauge", (),
+    lambda: {(): password_hasher.in_flight},
+)
+registry.callback(
+    "password_hash_capacity", "Limite de operações simultâneas do pool (workers + fila)", "gauge", (),
+    lambda: {(): password_hasher.workers + password_hasher.queue_size},
+)
+registry.callback(
+    "password_hash_rejected_total", "Operações recusadas com 429 por saturação do pool", "counter", ("operation",),
+    lambda: {(name,): stats.rejected for name, stats in password_hasher.stats.items()},
+)
+registry.callback(
+    "mongo_pool_connections", "Conexões do pool do Mongo por estado", "gauge", ("state",),
+    lambda: {("open",): pool_stats.open, ("checked_out",): pool_stats.checked_out},
+)
+registry.callback(
+    "mongo_pool_checkout_timeouts_total", "Esperas por conexão que estouraram waitQueueTimeoutMS", "counter", (),
+    lambda: {(): pool_stats.checkout_timeouts},
+)
+registry.callback(
+    "member_lookups_total", "Leituras de membro: executed = consultas ao banco, collapsed = agrupadas em outra",
+    "counter", ("outcome",),
+    lambda: {("executed",): member_lookups.executed, ("collapsed",): member_lookups.collapsed},
+)
+registry.callback(
+    "member_lookup_errors_total",
+    "Consultas de membro que falharam, estouraram o timeout ou foram recusadas com outra ainda presa no banco",
+    "counter", ("reason",),
+    lambda: {
+        ("failed",): member_lookups.failed,
+        ("timed_out",): member_lookups.timed_out,
+        ("rejected",): member_lookups.rejected,
+    },
+)
+registry.callback(
+    "member_lookups_stalled", "Consultas de membro que estouraram o timeout e ainda não terminaram", "gauge", (),
+    lambda: {(): member_lookups.stats()["stalled"]},
+)
+registry.callback(
+    "member_lookups_in_flight", "Consultas de membro em andamento", "gauge", (),
+    lambda: {(): len(member_lookups)},
+)
+
+
+@router.get("/metrics",
+            response_class=PlainTextResponse,
+            include_in_schema=False,
+            description="Métricas do processo no formato de texto do Prometheus"
+            )
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
@@ -1,34 +1,64 @@
 import logging
+from urllib.parse import unquote_plus
+
 from fastapi import APIRouter, Depends, status, Form, HTTPException, Request
-from fastapi.security import OAuth2PasswordRequestForm
+from fastapi.security import HTTPBasic, HTTPBasicCredentials
 
+from app.auth.grants import GRANT_HANDLERS, read_token_request
+from app.config.container import get_auth_controller
 from app.controllers.auth_controller import AuthenticateController
-from app.schemas.oauth_schema import Token, OAuth2ClientCredentialsRequestForm
-from app.utils.logger import setup_logger
+from app.schemas.oauth_schema import (
+    Token,
+    TokenIntrospection,
+    BatchIntrospectionRequest,
+    BatchIntrospectionResponse,
+)
+from app.utils.responses import NoStoreJSONResponse
 from typing import Optional
 
-router = APIRouter(prefix='/oauth')
-setup_logger()
+# Tokens e dados de tokens em todas as respostas: nenhuma pode ir para cache
+router = APIRouter(prefix='/oauth', default_response_class=NoStoreJSONResponse)
 LOGGER = logging.getLogger(__name__)
 
+# Os handlers se registram no import de app.auth.grants, então a lista já está completa aqui
+SUPPORTED_GRANT_TYPES = tuple(GRANT_HANDLERS)
+
+client_basic_auth = HTTPBasic(description="client_id e client_secret do cliente (RFC 6749, seção 2.3.1)")
+
+
+async def require_client(
+        request: Request,
+        credentials: HTTPBasicCredentials = Depends(client_basic_auth),
+        service: AuthenticateController = Depends(get_auth_controller)
+):
+    """Autenticação do cliente exigida pela RFC 7662 (seção 2.1) para a introspecção."""
+    # RFC 6749, seção 2.3.1: client_id e client_secret vêm form-urlencoded dentro do Basic
+    client_id, client_secret = unquote_plus(credentials.username), unquote_plus(credentials.password)
+    await service.enforce_rate_limit(
+        "introspection", request.client.host if request.client else None, {"client_id": client_id}
+    )
+    return await service.authenticate_client(client_id, client_secret, grant_type="introspection")
+
 @router.post("/token",
              response_model=Token,
              description="OAuth 2.0 token endpoint"
              )
 async def oauth_token(
         form_data: Request,
-        service: AuthenticateController = Depends(AuthenticateController)
+        service: AuthenticateController = Depends(get_auth_controller)
 ):
     """Endpoint OAuth 2.0 para obtenção de tokens
 
-    Suporta os seguintes grant types:
+    Suporta os grant types registrados em ``app.auth.grants``:
     - password: Para autenticação com username/password
     - refresh_token: Para renovar um token expirado
     - client_credentials: Para autenticação de aplicações cliente
     """
-    # Ler o corpo da requisição para determinar o grant_type
-    body = await form_data.form()
+    body = await read_token_request(form_data)
     grant_type = body.get("grant_type")
+    handler = GRANT_HANDLERS.get(grant_type)
+    # Rótulo das métricas; valores arbitrários do cliente não viram séries novas
+    form_data.state.grant_type = grant_type if handler is not None else "unsupported"
 
     if not grant_type:
         raise HTTPException(
@@ -36,39 +66,52 @@ async def oauth_token(
             detail="O parâmetro grant_type é obrigatório"
         )
 
-    if grant_type == "password":
-        # Converter para o formato esperado pelo método oauth_login
-        password_form = OAuth2PasswordRequestForm(
-            grant_type=grant_type,
-            username=body.get("username", ""),
-            password=body.get("password", ""),
-            scope=body.get("scope", ""),
-            client_id=body.get("client_id"),
-            client_secret=body.get("client_secret")
-        )
-        return service.oauth_login(password_form)
-
-    elif grant_type == "refresh_token":
-        refresh_token = body.get("refresh_token")
-        if not refresh_token:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Refresh token é obrigatório para grant_type 'refresh_token'"
-            )
-        return service.refresh_token(refresh_token)
-
-    elif grant_type == "client_credentials":
-        # Converter para o formato esperado pelo método client_credentials_login
-        client_creds_form = OAuth2ClientCredentialsRequestForm(
-            grant_type=grant_type,
-            scope=body.get("scope", ""),
-            client_id=body.get("client_id"),
-            client_secret=body.get("client_secret")
-        )
-        return service.client_credentials_login(client_creds_form)
+    await service.enforce_rate_limit(grant_type, form_data.client.host if form_data.client else None, body)
 
-    else:
+    if handler is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Grant type '{grant_type}' não suportado"
+            detail=f"Grant type '{grant_type}' não suportado; use {', '.join(SUPPORTED_GRANT_TYPES)}"
         )
+    # Token já montado pelo controller: serializado direto, sem revalidar contra o response_model
+    return NoStoreJSONResponse(await handler(service, body))
+
+
+@router.post("/revoke",
+             status_code=status.HTTP_200_OK,
+             description="OAuth 2.0 token revocation (RFC 7009)"
+             )
+async def oauth_revoke(
+        token: str = Form(...),
+        token_type_hint: Optional[str] = Form(default=None),
+        service: AuthenticateController = Depends(get_auth_controller)
+):
+    await service.revoke(token)
+    return {}
+
+
+@router.post("/introspect",
+             response_model=TokenIntrospection,
+             response_model_exclude_none=True,
+             description="OAuth 2.0 token introspection (RFC 7662)"
+             )
+async def oauth_introspect(
+        token: str = Form(...),
+        token_type_hint: Optional[str] = Form(default=None),
+        service: AuthenticateController = Depends(get_auth_controller),
+        client=Depends(require_client)
+):
+    return await service.introspect(token)
+
+
+@router.post("/introspect/batch",
+             response_model=BatchIntrospectionResponse,
+             response_model_exclude_none=True,
+             description="Introspecção de vários tokens por requisição"
+             )
+async def oauth_introspect_batch(
+        payload: BatchIntrospectionRequest,
+        service: AuthenticateController = Depends(get_auth_controller),
+        client=Depends(require_client)
+):
+    return await service.introspect_many(payload.tokens)
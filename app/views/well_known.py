@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Response
+
+from app.auth.keys import get_key_manager
+
+router = APIRouter(prefix='/.well-known')
+
+
+@router.get("/jwks.json",
+            description="Chaves públicas para validação local dos tokens"
+            )
+async def jwks(response: Response):
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return get_key_manager().jwks()
@@ -0,0 +1,78 @@
+"""Per-request cost of resolving the controllers.
+
+``legacy`` rebuilds what ``Depends(AuthenticateController)`` used to build on
+every request (controller, repository, ``AuthHandler`` with a fresh passlib
+``CryptContext``); ``container`` is the app-scoped lookup used now.
+
+    python -m benchmarks.bench_di --iterations 20000
+"""
+import argparse
+import tracemalloc
+from types import SimpleNamespace
+
+from benchmarks.harness import configure_environment, micro, print_table, write_results
+
+configure_environment()
+
+from app.auth.authentication import AuthHandler  # noqa: E402
+from app.auth.client_registry import client_registry  # noqa: E402
+from app.auth.hashing import password_hasher  # noqa: E402
+from app.auth.introspection import token_introspector  # noqa: E402
+from app.auth.rate_limit import rate_limiter  # noqa: E402
+from app.auth.scopes import scope_registry  # noqa: E402
+from app.config.container import Container, get_auth_controller  # noqa: E402
+from app.controllers.auth_controller import AuthenticateController  # noqa: E402
+from app.repository.repository_factory import get_member_repository  # noqa: E402
+from app.repository.revocation_repository import revocation_store  # noqa: E402
+
+
+def legacy():
+    return AuthenticateController(
+        member_repository=get_member_repository(),
+        auth_handler=AuthHandler(),
+        password_hasher=password_hasher,
+        client_registry=client_registry,
+        token_introspector=token_introspector,
+        revocation_store=revocation_store,
+        rate_limiter=rate_limiter,
+        scope_registry=scope_registry,
+    )
+
+
+def allocated_bytes(func, iterations):
+    """Average bytes allocated per call, kept alive until the call returns."""
+    tracemalloc.start()
+    try:
+        total = 0
+        for _ in range(iterations):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            func()
+            total += tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return total / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--output", help="JSON file (default: benchmarks/results/di-<rev>.json)")
+    args = parser.parse_args()
+
+    request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(container=Container.from_settings())))
+    container = lambda: get_auth_controller(request)  # noqa: E731
+
+    results = {}
+    for case, func in (("di:legacy", legacy), ("di:container", container)):
+        results[case] = micro(func, args.iterations)
+        results[case]["bytes_per_call"] = allocated_bytes(func, min(args.iterations, 2000))
+
+    print_table(results)
+    for case, stats in results.items():
+        print(f"{case:<36}{stats['bytes_per_call']:>10.0f} bytes/req")
+    print(f"\nResultados gravados em {write_results('di', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
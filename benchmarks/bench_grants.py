@@ -0,0 +1,102 @@
+"""Per-request cost of reading /oauth/token parameters, before any grant work.
+
+``legacy`` is what the endpoint used to do: ``request.form()`` through
+python-multipart, then ``OAuth2PasswordRequestForm`` /
+``OAuth2ClientCredentialsRequestForm`` picked by an if/elif on grant_type.
+``fast`` is ``read_token_request`` plus the slotted structs of
+``app.auth.grants``, picked from the handler table.
+
+    python -m benchmarks.bench_grants --iterations 20000
+"""
+import argparse
+import asyncio
+from urllib.parse import urlencode
+
+from benchmarks.harness import amicro, configure_environment, print_table, write_results
+
+configure_environment()
+
+from fastapi import Request  # noqa: E402
+from fastapi.security import OAuth2PasswordRequestForm  # noqa: E402
+
+from app.auth.grants import GRANT_HANDLERS, ClientCredentialsGrant, PasswordGrant, read_token_request  # noqa: E402
+from app.schemas.oauth_schema import OAuth2ClientCredentialsRequestForm  # noqa: E402
+
+BODIES = {
+    "password": urlencode({
+        "grant_type": "password", "username": "bench@example.com", "password": "bench-password",
+        "scope": "read:profile update:profile",
+    }).encode(),
+    "client_credentials": urlencode({
+        "grant_type": "client_credentials", "client_id": "bench-client", "client_secret": "bench-secret",
+        "scope": "read:api",
+    }).encode(),
+}
+STRUCTS = {"password": PasswordGrant, "client_credentials": ClientCredentialsGrant}
+
+
+def make_request(body):
+    scope = {
+        "type": "http", "method": "POST", "path": "/oauth/token", "query_string": b"",
+        "headers": [
+            (b"content-type", b"application/x-www-form-urlencoded"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return Request(scope, receive)
+
+
+async def legacy(body):
+    form = await make_request(body).form()
+    grant_type = form.get("grant_type")
+    if grant_type == "password":
+        return OAuth2PasswordRequestForm(
+            grant_type=grant_type,
+            username=form.get("username", ""),
+            password=form.get("password", ""),
+            scope=form.get("scope", ""),
+            client_id=form.get("client_id"),
+            client_secret=form.get("client_secret"),
+        )
+    elif grant_type == "client_credentials":
+        return OAuth2ClientCredentialsRequestForm(
+            grant_type=grant_type,
+            scope=form.get("scope", ""),
+            client_id=form.get("client_id"),
+            client_secret=form.get("client_secret"),
+        )
+
+
+async def fast(body):
+    params = await read_token_request(make_request(body))
+    grant_type = params.get("grant_type")
+    # Mesmo lookup do endpoint; o struct é montado aqui porque os handlers já chamam o controller
+    GRANT_HANDLERS.get(grant_type)
+    return STRUCTS[grant_type](params)
+
+
+async def run(iterations):
+    results = {}
+    for grant_type, body in BODIES.items():
+        for name, func in (("legacy", legacy), ("fast", fast)):
+            results[f"grants:{grant_type}:{name}"] = await amicro(lambda: func(body), iterations)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--output", help="JSON file (default: benchmarks/results/grants-<rev>.json)")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.iterations))
+    print_table(results)
+    print(f"\nResultados gravados em {write_results('grants', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Verify latency of candidate password-hashing policies on this host.
+
+Each candidate is measured in-process (one core, as a pool worker would run
+it), so the numbers are the per-login CPU cost to weigh against the latency
+budget before changing BCRYPT_ROUNDS / PASSWORD_SCHEMES / ARGON2_*.
+
+    python -m benchmarks.bench_hashing --bcrypt-rounds 10 11 12 13 --argon2 65536:3:4 19456:2:1
+"""
+import argparse
+
+from benchmarks.harness import configure_environment, micro, print_table, write_results
+
+configure_environment()
+
+from passlib.context import CryptContext  # noqa: E402
+from passlib.hash import argon2  # noqa: E402
+
+from app.auth.hashing import password_policy  # noqa: E402
+
+PASSWORD = "bench-password"
+
+
+def candidates(args):
+    for rounds in args.bcrypt_rounds:
+        yield f"bcrypt:rounds={rounds}", password_policy(schemes=["bcrypt"], bcrypt_rounds=rounds)
+    for spec in args.argon2:
+        memory_cost, time_cost, parallelism = (int(part) for part in spec.split(":"))
+        yield (
+            f"argon2id:m={memory_cost},t={time_cost},p={parallelism}",
+            password_policy(schemes=["argon2"], argon2_memory_cost=memory_cost,
+                            argon2_time_cost=time_cost, argon2_parallelism=parallelism),
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bcrypt-rounds", type=int, nargs="*", default=[10, 11, 12, 13])
+    parser.add_argument("--argon2", nargs="*", default=["65536:3:4", "19456:2:1"],
+                        help="memory_cost(KiB):time_cost:parallelism; ignorado sem argon2-cffi")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--output", help="JSON file (default: benchmarks/results/hashing-<rev>.json)")
+    args = parser.parse_args()
+    if args.argon2 and not argon2.has_backend():
+        print("argon2-cffi não instalado: candidatos argon2 ignorados\n")
+        args.argon2 = []
+
+    results = {}
+    for case, policy in candidates(args):
+        context = CryptContext(**policy)
+        hashed = context.hash(PASSWORD)
+        results[case] = micro(lambda: context.verify(PASSWORD, hashed), args.iterations)
+
+    print_table(results)
+    print(f"\nResultados gravados em {write_results('hashing', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Cost of minting the login token pair.
+
+``jose`` is the path the handler used originally (``data.copy()``, several
+``datetime.utcnow()`` calls and ``jose.jwt.encode`` per token; HMAC
+algorithms only), ``separate`` is ``create_access_token`` +
+``create_refresh_token`` and ``pair`` is ``create_token_pair``. The run
+aborts if the tokens are not byte-identical to python-jose's.
+
+    python -m benchmarks.bench_jwt --iterations 20000
+"""
+import argparse
+import uuid
+import warnings
+from datetime import datetime, timedelta
+from unittest import mock
+
+from benchmarks.harness import configure_environment, micro, print_table, write_results
+
+configure_environment()
+
+from jose import jwt  # noqa: E402
+
+from app.auth.authentication import AuthHandler  # noqa: E402
+from app.config.settings import settings  # noqa: E402
+
+CLAIMS = {"sub": "bench@example.com", "name": "bench", "key": "bench-key", "privilege": 3}
+SCOPES = ["read:profile", "update:profile", "read:admin"]
+
+
+def jose_pair(handler):
+    access = CLAIMS.copy()
+    access.update({"scopes": SCOPES})
+    access.update({"exp": datetime.utcnow() + timedelta(minutes=handler.access_token_expire_minutes)})
+    access.update({"iat": datetime.utcnow()})
+    access.update({"token_type": "access_token"})
+    refresh = CLAIMS.copy()
+    jti = uuid.uuid4().hex
+    refresh.update({"exp": datetime.utcnow() + timedelta(days=handler.refresh_token_expire_days)})
+    refresh.update({"iat": datetime.utcnow()})
+    refresh.update({"token_type": "refresh_token"})
+    refresh.update({"jti": jti, "fid": jti})
+    return (jwt.encode(access, settings.secret_key, algorithm=handler.algorithm),
+            jwt.encode(refresh, settings.secret_key, algorithm=handler.algorithm))
+
+
+def check_compatibility(handler):
+    """Mesmo instante e mesmo jti: os caminhos precisam gerar os mesmos bytes."""
+    now = 1893499200.5
+    with mock.patch("uuid.uuid4") as uuid4, mock.patch("time.time", return_value=now):
+        uuid4.return_value.hex = "0" * 32
+        separate = (
+            handler.create_access_token(CLAIMS, scopes=SCOPES),
+            handler.create_refresh_token(CLAIMS, scopes=SCOPES),
+        )
+        pair = handler.create_token_pair(CLAIMS, scopes=SCOPES)
+    if separate != pair:
+        raise SystemExit("create_token_pair diverge de create_access_token/create_refresh_token")
+    if handler.algorithm.startswith("HS"):
+        claims = {
+            **CLAIMS, "scopes": SCOPES, "exp": int(now) + handler.access_token_expire_minutes * 60,
+            "iat": int(now), "token_type": "access_token",
+        }
+        if jwt.encode(claims, settings.secret_key, algorithm=handler.algorithm) != separate[0]:
+            raise SystemExit("Token diverge do python-jose")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--output", help="JSON file (default: benchmarks/results/jwt-<rev>.json)")
+    args = parser.parse_args()
+
+    # O caminho original usa datetime.utcnow(), depreciado no Python 3.12
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
+    handler = AuthHandler()
+    check_compatibility(handler)
+
+    results = {}
+    if handler.algorithm.startswith("HS"):
+        results["jwt:jose"] = micro(lambda: jose_pair(handler), args.iterations)
+    results["jwt:separate"] = micro(
+        lambda: (handler.create_access_token(CLAIMS, scopes=SCOPES), handler.create_refresh_token(CLAIMS, scopes=SCOPES)),
+        args.iterations,
+    )
+    results["jwt:pair"] = micro(lambda: handler.create_token_pair(CLAIMS, scopes=SCOPES), args.iterations)
+
+    print_table(results)
+    print(f"\nResultados gravados em {write_results('jwt', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Cost of the member auth record returned by ``get_member_auth``.
+
+``dict`` is the projected document as the repositories used to return it;
+``record`` is ``MemberAuthRecord.from_document``. Both start from the raw
+document PyMongo hands back; ``bytes_per_record`` is what each cached entry
+keeps alive beyond the field values themselves.
+
+    python -m benchmarks.bench_member_record --iterations 200000
+"""
+import argparse
+import tracemalloc
+
+from benchmarks.harness import configure_environment, micro, print_table, write_results
+
+configure_environment()
+
+from app.models.member_models import MEMBER_AUTH_FIELDS, MemberAuthRecord  # noqa: E402
+
+DOCUMENT = {
+    "email": "bench@example.com",
+    "password": "$2b$12$" + "x" * 53,
+    "key_member": "bench-key",
+    "privilege_level": 3,
+    "name": "bench",
+    "disabled": False,
+}
+BUILDERS = {
+    "dict": lambda document: {field: document[field] for field in MEMBER_AUTH_FIELDS if field in document},
+    "record": MemberAuthRecord.from_document,
+}
+
+
+def retained_bytes(build, count):
+    """Average bytes held per built object while ``count`` of them are alive."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = [build(DOCUMENT) for _ in range(count)]
+        total = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    # A própria lista também é contada; descontada pelo tamanho de um ponteiro por item
+    return total / len(kept) - 8
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200000)
+    parser.add_argument("--output", help="JSON file (default: benchmarks/results/member_record-<rev>.json)")
+    args = parser.parse_args()
+
+    results = {}
+    for name, build in BUILDERS.items():
+        results[f"member_auth:{name}"] = micro(lambda: build(DOCUMENT), args.iterations)
+        results[f"member_auth:{name}"]["bytes_per_record"] = retained_bytes(build, min(args.iterations, 100000))
+
+    print_table(results)
+    for case, stats in results.items():
+        print(f"{case:<36}{stats['bytes_per_record']:>10.0f} bytes/registro")
+    print(f"\nResultados gravados em {write_results('member_record', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
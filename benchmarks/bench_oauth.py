@@ -0,0 +1,152 @@
+"""End-to-end latency/throughput of /oauth/token grants and /members/register.
+
+Runs against an in-process app built by ``get_app()`` with the in-memory
+member repository, then micro-benchmarks the AuthHandler primitives.
+
+    python -m benchmarks.bench_oauth --concurrency 16 --iterations 2000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.harness import (
+    ASGIClient, configure_environment, micro, print_table, summarize, write_results,
+)
+
+configure_environment()
+
+from app.application import get_app  # noqa: E402
+from app.auth.authentication import AuthHandler  # noqa: E402
+
+PASSWORD = "bench-password"
+
+
+def member_payload(index):
+    return {
+        "name": f"bench{index}",
+        "username": f"bench{index}",
+        "email": f"bench{index}@example.com",
+        "password": PASSWORD,
+        "key_member": f"bench-key-{index}",
+    }
+
+
+async def run_workers(concurrency, iterations, make_worker):
+    """Run ``concurrency`` workers that share ``iterations`` requests; returns stats."""
+    latencies = []
+    errors = 0
+    per_worker = max(1, iterations // concurrency)
+
+    async def worker(index):
+        nonlocal errors
+        step = make_worker(index)
+        for _ in range(per_worker):
+            t0 = time.perf_counter()
+            ok = await step()
+            latencies.append(time.perf_counter() - t0)
+            if not ok:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - start, errors)
+
+
+async def bench_endpoints(args):
+    client = ASGIClient(get_app())
+    await client.startup()
+    results = {}
+    try:
+        counter = iter(range(10**9))
+
+        def register_worker(_):
+            async def step():
+                status, _ = await client.post_json("/members/register", member_payload(next(counter)))
+                return status == 201
+            return step
+
+        results["register"] = await run_workers(args.concurrency, args.password_iterations, register_worker)
+
+        def password_worker(index):
+            async def step():
+                status, _ = await client.post_form("/oauth/token", {
+                    "grant_type": "password", "username": f"bench{index}@example.com", "password": PASSWORD,
+                })
+                return status == 200
+            return step
+
+        results["grant:password"] = await run_workers(args.concurrency, args.password_iterations, password_worker)
+
+        # Login inicial fora da medição; refresh tokens são rotacionados, então cada worker segue a própria cadeia
+        refresh_tokens = {}
+        for index in range(args.concurrency):
+            _, body = await client.post_form("/oauth/token", {
+                "grant_type": "password", "username": f"bench{index}@example.com", "password": PASSWORD,
+            })
+            refresh_tokens[index] = json.loads(body)["refresh_token"]
+
+        def refresh_worker(index):
+            async def step():
+                status, body = await client.post_form("/oauth/token", {
+                    "grant_type": "refresh_token", "refresh_token": refresh_tokens[index],
+                })
+                if status != 200:
+                    return False
+                refresh_tokens[index] = json.loads(body)["refresh_token"]
+                return True
+            return step
+
+        results["grant:refresh_token"] = await run_workers(args.concurrency, args.iterations, refresh_worker)
+
+        def client_credentials_worker(index):
+            async def step():
+                status, _ = await client.post_form("/oauth/token", {
+                    "grant_type": "client_credentials",
+                    "client_id": f"bench{index}@example.com",
+                    "client_secret": f"bench-key-{index}",
+                })
+                return status == 200
+            return step
+
+        results["grant:client_credentials"] = await run_workers(
+            args.concurrency, args.iterations, client_credentials_worker
+        )
+    finally:
+        await client.shutdown()
+    return results
+
+
+def bench_primitives(args):
+    handler = AuthHandler()
+    claims = {"sub": "bench@example.com", "name": "bench", "key": "bench-key", "privilege": 1}
+    token = handler.create_access_token(claims, scopes=["read:profile"])
+    hashed = handler.get_password_hash(PASSWORD)
+    return {
+        "auth:create_access_token": micro(lambda: handler.create_access_token(claims, scopes=["read:profile"]),
+                                          args.micro_iterations),
+        "auth:decode_token": micro(lambda: handler.decode_token(token), args.micro_iterations),
+        "auth:verify_password": micro(lambda: handler.verify_password(PASSWORD, hashed),
+                                      max(1, args.password_iterations // 4)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=2000, help="requests per cheap grant")
+    parser.add_argument("--password-iterations", type=int, default=64,
+                        help="requests for the bcrypt-bound cases (register, password grant)")
+    parser.add_argument("--micro-iterations", type=int, default=5000)
+    parser.add_argument("--output", help="JSON file (default: benchmarks/results/oauth-<rev>.json)")
+    args = parser.parse_args()
+    args.concurrency = min(args.concurrency, args.password_iterations)
+
+    results = asyncio.run(bench_endpoints(args))
+    results.update(bench_primitives(args))
+    print_table(results)
+    print(f"\nResultados gravados em {write_results('oauth', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
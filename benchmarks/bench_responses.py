@@ -0,0 +1,66 @@
+"""Per-response serialization cost of the auth and member routes.
+
+``default`` is what FastAPI does with a ``response_model=Token`` return
+value (validate against the response field, ``jsonable_encoder``, stdlib
+``JSONResponse``); ``fast`` is the controller-built ``Token`` handed to
+``NoStoreJSONResponse`` as is.
+
+    python -m benchmarks.bench_responses --iterations 20000
+"""
+import argparse
+import asyncio
+
+from benchmarks.harness import amicro, configure_environment, print_table, write_results
+
+configure_environment()
+
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+
+from app.schemas.oauth_schema import Token  # noqa: E402
+from app.utils.responses import NoStoreJSONResponse  # noqa: E402
+
+TOKEN = Token(
+    access_token="a" * 280,
+    token_type="bearer",
+    expires_in=1800,
+    refresh_token="r" * 380,
+    scope="read:profile update:profile",
+)
+TOKEN_FIELD = create_model_field(name="Response_oauth_token", type_=Token, mode="serialization")
+
+
+async def token_default():
+    content = await serialize_response(field=TOKEN_FIELD, response_content=TOKEN)
+    return JSONResponse(content)
+
+
+async def token_fast():
+    return NoStoreJSONResponse(TOKEN)
+
+
+async def run(iterations):
+    return {
+        "responses:token:default": await amicro(token_default, iterations),
+        "responses:token:fast": await amicro(token_fast, iterations),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--output", help="JSON file (default: benchmarks/results/responses-<rev>.json)")
+    args = parser.parse_args()
+
+    # Mesmo corpo nos dois caminhos; só cabeçalhos e custo mudam
+    if asyncio.run(token_default()).body != asyncio.run(token_fast()).body:
+        raise SystemExit("NoStoreJSONResponse diverge da serialização do response_model")
+
+    results = asyncio.run(run(args.iterations))
+    print_table(results)
+    print(f"\nResultados gravados em {write_results('responses', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
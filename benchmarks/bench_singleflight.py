@@ -0,0 +1,99 @@
+"""Refresh storm: many concurrent lookups of the same few members.
+
+Simulates a release that makes every client refresh at once: ``--requests``
+concurrent ``get_member_auth`` calls spread over ``--accounts`` members,
+against an in-memory repository that takes ``--db-latency-ms`` per query and
+serves at most ``--db-concurrency`` queries at a time (the pool size).
+``direct`` hits the repository for every request; ``coalesced`` goes
+through ``CoalescingMemberRepository``. The member cache is left out so
+every request reaches this layer.
+
+    python -m benchmarks.bench_singleflight --requests 5000 --accounts 20
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.harness import configure_environment, print_table, summarize, write_results
+
+configure_environment()
+
+from app.repository.coalescing_member_repository import CoalescingMemberRepository  # noqa: E402
+from app.repository.memory_member_repository import InMemoryMemberRepository  # noqa: E402
+from app.utils.singleflight import SingleFlight  # noqa: E402
+
+
+class SlowRepository(InMemoryMemberRepository):
+    """In-memory repository with a fixed query latency and a bounded pool."""
+
+    def __init__(self, storage, latency, concurrency):
+        super().__init__(storage)
+        self.latency = latency
+        self.pool = asyncio.Semaphore(concurrency)
+        self.queries = 0
+
+    async def get_member_auth(self, email):
+        async with self.pool:
+            self.queries += 1
+            await asyncio.sleep(self.latency)
+            return await super().get_member_auth(email)
+
+
+def storage_for(accounts):
+    return {
+        f"bench{index}@example.com": {
+            "email": f"bench{index}@example.com", "password": "$2b$12$" + "x" * 53,
+            "key_member": f"bench-key-{index}", "privilege_level": 1, "name": f"bench{index}",
+        }
+        for index in range(accounts)
+    }
+
+
+async def storm(repository, requests, accounts):
+    latencies = []
+
+    async def lookup(index):
+        start = time.perf_counter()
+        await repository.get_member_auth(f"bench{index % accounts}@example.com")
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(lookup(index) for index in range(requests)))
+    return summarize(latencies, time.perf_counter() - start)
+
+
+async def run(args):
+    storage = storage_for(args.accounts)
+    results = {}
+
+    direct = SlowRepository(storage, args.db_latency_ms / 1000, args.db_concurrency)
+    results["storm:direct"] = await storm(direct, args.requests, args.accounts)
+    results["storm:direct"]["db_queries"] = direct.queries
+
+    base = SlowRepository(storage, args.db_latency_ms / 1000, args.db_concurrency)
+    lookups = SingleFlight(timeout=None)
+    coalesced = CoalescingMemberRepository(base, lookups)
+    results["storm:coalesced"] = await storm(coalesced, args.requests, args.accounts)
+    results["storm:coalesced"]["db_queries"] = base.queries
+    results["storm:coalesced"]["collapsed"] = lookups.collapsed
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--accounts", type=int, default=20)
+    parser.add_argument("--db-latency-ms", type=float, default=5.0)
+    parser.add_argument("--db-concurrency", type=int, default=100)
+    parser.add_argument("--output", help="JSON file (default: benchmarks/results/singleflight-<rev>.json)")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print_table(results)
+    for case, stats in results.items():
+        print(f"{case:<36}{stats['db_queries']:>10} consultas ao banco")
+    print(f"\nResultados gravados em {write_results('singleflight', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
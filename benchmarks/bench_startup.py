@@ -0,0 +1,135 @@
+"""Cold start: import time, app construction and time to first response.
+
+Each run is a fresh interpreter, which is what a new pod or a recycled
+worker pays. In-process runs time ``import app.application``, ``get_app()``,
+the lifespan startup and the first ``/health/live`` request separately;
+``process`` is the wall time seen by the parent, interpreter boot included.
+
+``--gunicorn`` instead starts the production server
+(``app.config.gunicorn_conf``) and measures the time until ``/health/live``
+answers over TCP. With more than one worker the revocation store has to
+be the Mongo one, so that mode needs ``MONGO_URL`` to reach a server.
+
+    python -m benchmarks.bench_startup --runs 10
+    python -m benchmarks.bench_startup --gunicorn --workers 2 --runs 3
+"""
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+from benchmarks.harness import ASGIClient, configure_environment, print_table, summarize, write_results
+
+PHASES = ("import", "get_app", "lifespan", "first_response")
+
+
+async def probe():
+    """Runs inside the child process; prints the duration of each phase in seconds."""
+    timings = {}
+    start = time.perf_counter()
+    from app.application import get_app
+    timings["import"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    app = get_app()
+    timings["get_app"] = time.perf_counter() - start
+
+    client = ASGIClient(app)
+    start = time.perf_counter()
+    await client.startup()
+    timings["lifespan"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    status, _ = await client.request("GET", "/health/live")
+    timings["first_response"] = time.perf_counter() - start
+    await client.shutdown()
+    if status != 200:
+        raise RuntimeError(f"/health/live respondeu {status}")
+    print(json.dumps(timings))
+
+
+def run_in_process(runs):
+    samples = {phase: [] for phase in PHASES + ("process",)}
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_startup", "--probe"],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        samples["process"].append(time.perf_counter() - start)
+        for phase, seconds in json.loads(output.strip().splitlines()[-1]).items():
+            samples[phase].append(seconds)
+    return samples
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_live(port, deadline):
+    while time.perf_counter() < deadline:
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+        try:
+            connection.request("GET", "/health/live")
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.01)
+        finally:
+            connection.close()
+    raise TimeoutError(f"Servidor não respondeu na porta {port}")
+
+
+def run_gunicorn(runs, workers, timeout):
+    samples = {"gunicorn_first_response": []}
+    for _ in range(runs):
+        port = free_port()
+        env = dict(os.environ, HOST="127.0.0.1", FASTAPI_PORT=str(port), WEB_WORKERS=str(workers))
+        if workers > 1:
+            # gunicorn_conf recusa o store em memória com vários workers
+            env.pop("REVOCATION_STORE_BACKEND", None)
+        start = time.perf_counter()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-c", "python:app.config.gunicorn_conf", "app.application:get_app()"],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_until_live(port, start + timeout)
+            samples["gunicorn_first_response"].append(time.perf_counter() - start)
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=30)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--gunicorn", action="store_true", help="measure the gunicorn server instead")
+    parser.add_argument("--workers", type=int, default=1, help="gunicorn workers (--gunicorn only)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for the server")
+    parser.add_argument("--probe", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--output", help="JSON file (default: benchmarks/results/startup-<rev>.json)")
+    args = parser.parse_args()
+
+    configure_environment()
+    if args.probe:
+        asyncio.run(probe())
+        return
+
+    samples = run_gunicorn(args.runs, args.workers, args.timeout) if args.gunicorn else run_in_process(args.runs)
+    results = {f"startup:{phase}": summarize(seconds, sum(seconds)) for phase, seconds in samples.items()}
+    print_table(results)
+    print(f"\nResultados gravados em {write_results('startup', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Compare two benchmark result files case by case.
+
+    python -m benchmarks.compare benchmarks/results/oauth-abc123.json benchmarks/results/oauth-def456.json
+"""
+import argparse
+import json
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    print(f"{baseline['revision']} -> {candidate['revision']}")
+    print(f"{'case':<36}{'p50 ms':>18}{'p99 ms':>18}{'req/s':>20}")
+    for case, new in candidate["results"].items():
+        old = baseline["results"].get(case)
+        if old is None:
+            print(f"{case:<36}{'(novo)':>18}")
+            continue
+        print(f"{case:<36}{_delta(old['p50_ms'], new['p50_ms']):>18}{_delta(old['p99_ms'], new['p99_ms']):>18}"
+              f"{_delta(old['throughput_rps'], new['throughput_rps']):>20}")
+
+
+def _delta(old, new):
+    change = ((new - old) / old * 100) if old else 0.0
+    return f"{new:.3f} ({change:+.1f}%)"
+
+
+if __name__ == "__main__":
+    main()
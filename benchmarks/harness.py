@@ -0,0 +1,177 @@
+"""Helpers shared by the benchmark scripts.
+
+Requests are driven straight into the ASGI app (no sockets, no HTTP client
+dependency) and results are written as JSON so runs from different commits
+can be diffed with ``python -m benchmarks.compare``.
+"""
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from pathlib import Path
+from urllib.parse import urlencode
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def configure_environment():
+    """Point the app at the in-memory backends before it is imported."""
+    os.environ.setdefault("REPOSITORY_BACKEND", "memory")
+    os.environ.setdefault("REVOCATION_STORE_BACKEND", "memory")
+    # Evita resolução SRV/DNS do MONGO_URL do .env; nada é conectado no backend em memória
+    os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+    os.environ.setdefault("LOG_LEVEL", "warning")
+    # Todas as requisições vêm do mesmo IP e usuários; o limite falsearia as medições
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+
+class ASGIClient:
+    """Minimal in-process client: one coroutine call per request."""
+
+    def __init__(self, app):
+        self.app = app
+        self._lifespan_task = None
+        self._lifespan_queue = None
+
+    async def startup(self):
+        self._lifespan_queue = asyncio.Queue()
+        started = asyncio.get_running_loop().create_future()
+        self._stopped = asyncio.get_running_loop().create_future()
+
+        async def send(message):
+            if message["type"] == "lifespan.startup.complete":
+                started.set_result(True)
+            elif message["type"] == "lifespan.startup.failed":
+                started.set_exception(RuntimeError(message.get("message")))
+            elif message["type"].startswith("lifespan.shutdown"):
+                self._stopped.set_result(True)
+
+        scope = {"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}
+        self._lifespan_task = asyncio.create_task(self.app(scope, self._lifespan_queue.get, send))
+        await self._lifespan_queue.put({"type": "lifespan.startup"})
+        await started
+
+    async def shutdown(self):
+        await self._lifespan_queue.put({"type": "lifespan.shutdown"})
+        await self._stopped
+        await self._lifespan_task
+
+    async def request(self, method, path, body=b"", content_type=None, headers=()):
+        headers = [(b"host", b"testserver"), (b"content-length", str(len(body)).encode()), *headers]
+        if content_type:
+            headers.append((b"content-type", content_type.encode()))
+        path, _, query = path.partition("?")
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": method, "scheme": "http", "path": path, "raw_path": path.encode(),
+            "query_string": query.encode(), "root_path": "", "headers": headers,
+            "client": ("127.0.0.1", 50000), "server": ("testserver", 80), "state": {},
+        }
+        done = asyncio.Event()
+        sent = False
+        response = {"status": None, "body": []}
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    done.set()
+
+        await self.app(scope, receive, send)
+        return response["status"], b"".join(response["body"])
+
+    async def post_form(self, path, data):
+        return await self.request("POST", path, urlencode(data).encode(), "application/x-www-form-urlencoded")
+
+    async def post_json(self, path, data):
+        return await self.request("POST", path, json.dumps(data).encode(), "application/json")
+
+
+def summarize(latencies, elapsed, errors=0):
+    """p50/p99/mean in milliseconds plus throughput for a list of latencies (seconds)."""
+    ordered = sorted(latencies)
+    count = len(ordered)
+
+    def percentile(p):
+        if not ordered:
+            return 0.0
+        return ordered[min(count - 1, int(round(p / 100 * (count - 1))))] * 1000
+
+    return {
+        "count": count,
+        "errors": errors,
+        "p50_ms": percentile(50),
+        "p90_ms": percentile(90),
+        "p99_ms": percentile(99),
+        "mean_ms": statistics.fmean(ordered) * 1000 if ordered else 0.0,
+        "throughput_rps": count / elapsed if elapsed else 0.0,
+    }
+
+
+def micro(func, iterations):
+    """Time ``iterations`` sequential calls of a synchronous callable."""
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+async def amicro(func, iterations):
+    """``micro`` for a coroutine function, awaited sequentially on the running loop."""
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        await func()
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def write_results(name, results, output=None):
+    revision = git_revision()
+    payload = {
+        "benchmark": name,
+        "revision": revision,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    path = Path(output) if output else RESULTS_DIR / f"{name}-{revision}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2))
+    return path
+
+
+def print_table(results):
+    print(f"{'case':<36}{'count':>8}{'p50 ms':>10}{'p99 ms':>10}{'req/s':>12}")
+    for case, stats in results.items():
+        print(f"{case:<36}{stats['count']:>8}{stats['p50_ms']:>10.3f}{stats['p99_ms']:>10.3f}"
+              f"{stats['throughput_rps']:>12.1f}")
@@ -0,0 +1,51 @@
+import asyncio
+import uuid
+
+import pytest
+
+from benchmarks.harness import ASGIClient, configure_environment
+
+# Backends em memória e sem rate limit antes de qualquer import do app
+configure_environment()
+
+from app.application import get_app  # noqa: E402
+
+
+@pytest.fixture
+def run():
+    """Roda a corrotina num event loop novo, como o teste síncrono espera."""
+    return asyncio.run
+
+
+@pytest.fixture
+def email():
+    return f"{uuid.uuid4().hex}@example.com"
+
+
+class AppSession:
+    """App com lifespan iniciado e um membro cadastrado via /members/register."""
+
+    def __init__(self, app, client):
+        self.app = app
+        self.client = client
+
+    @property
+    def container(self):
+        return self.app.state.container
+
+    async def register(self, email, password="secret"):
+        status, _ = await self.client.post_json(
+            "/members/register", {"name": "test", "username": "test", "email": email, "password": password}
+        )
+        assert status == 201
+        return password
+
+
+@pytest.fixture
+def session_factory():
+    async def start():
+        app = get_app()
+        client = ASGIClient(app)
+        await client.startup()
+        return AppSession(app, client)
+    return start
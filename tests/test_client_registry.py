@@ -0,0 +1,53 @@
+import datetime
+
+from app.auth.client_registry import ClientRegistry
+from app.models.member_models import MemberAuthRecord
+from app.repository.memory_member_repository import InMemoryMemberRepository
+
+
+def _member(email, key="secret"):
+    return {
+        "email": email, "key_member": key, "name": "client", "privilege_level": 1,
+        "disabled": False, "updated_at": datetime.datetime.utcnow(),
+    }
+
+
+class CountingRepository(InMemoryMemberRepository):
+    def __init__(self, storage):
+        super().__init__(storage)
+        self.requested = []
+
+    async def list_clients(self, updated_since=None, emails=None):
+        self.requested.extend(emails or ())
+        return await super().list_clients(updated_since, emails)
+
+
+def test_registry_only_syncs_clients_that_authenticated(run):
+    storage = {f"m{index}@example.com": _member(f"m{index}@example.com") for index in range(50)}
+    repository = CountingRepository(storage)
+    registry = ClientRegistry("key", refresh_interval=60)
+
+    async def scenario():
+        assert await registry.refresh(repository, full=True) == 0
+        assert repository.requested == []
+
+        registry.upsert(MemberAuthRecord.from_document(storage["m1@example.com"]))
+        storage["m1@example.com"].update(key_member="rotated", updated_at=datetime.datetime.utcnow())
+        assert await registry.refresh(repository, full=False) == 1
+        assert repository.requested == ["m1@example.com"]
+        assert registry.verify(registry.get("m1@example.com"), "rotated")
+
+        del storage["m1@example.com"]
+        await registry.refresh(repository, full=True)
+        assert registry.get("m1@example.com") is None
+
+    run(scenario())
+
+
+def test_registry_evicts_the_oldest_client_past_max_size():
+    registry = ClientRegistry("key", refresh_interval=60, max_size=2)
+    for email in ("a@example.com", "b@example.com", "c@example.com"):
+        registry.upsert(MemberAuthRecord.from_document(_member(email)))
+    assert len(registry) == 2
+    assert registry.get("a@example.com") is None
+    assert registry.get("c@example.com") is not None
@@ -0,0 +1,22 @@
+import os
+import signal
+
+from app.auth.hashing import PasswordHasher, password_policy
+
+
+def test_hasher_replaces_a_broken_pool(run):
+    hasher = PasswordHasher(workers=1, queue_size=4, policy=password_policy(bcrypt_rounds=4))
+
+    async def scenario():
+        stored = await hasher.hash("secret")
+        broken = hasher._executor
+        for pid in list(broken._processes):
+            os.kill(pid, signal.SIGKILL)
+        # A operação seguinte recria o pool em vez de falhar até o restart
+        assert await hasher.verify("secret", stored)
+        assert hasher._executor is not broken
+
+    try:
+        run(scenario())
+    finally:
+        hasher.shutdown()
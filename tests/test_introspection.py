@@ -0,0 +1,56 @@
+import base64
+import json
+from urllib.parse import urlencode
+
+
+def _basic(client_id, client_secret):
+    credentials = base64.b64encode(f"{client_id}:{client_secret}".encode()).decode()
+    return [(b"authorization", f"Basic {credentials}".encode())]
+
+
+async def _introspect(session, token, client):
+    body = urlencode({"token": token}).encode()
+    status, response = await session.client.request(
+        "POST", "/oauth/introspect", body, "application/x-www-form-urlencoded", headers=_basic(*client)
+    )
+    assert status == 200
+    return json.loads(response)
+
+
+async def _setup(session, email):
+    password = await session.register(email)
+    status, body = await session.client.post_form(
+        "/oauth/token", {"grant_type": "password", "username": email, "password": password}
+    )
+    assert status == 200
+    member = await session.container.member_repository.get_member(email)
+    return json.loads(body), (email, member["key_member"])
+
+
+def test_consumed_refresh_token_is_inactive(run, email, session_factory):
+    async def scenario():
+        session = await session_factory()
+        try:
+            tokens, client = await _setup(session, email)
+            assert (await _introspect(session, tokens["refresh_token"], client))["active"] is True
+
+            rotated = await session.container.auth_controller.refresh_token(tokens["refresh_token"])
+            assert (await _introspect(session, tokens["refresh_token"], client)) == {"active": False}
+            assert (await _introspect(session, rotated.refresh_token, client))["active"] is True
+        finally:
+            await session.client.shutdown()
+
+    run(scenario())
+
+
+def test_refresh_token_of_revoked_family_is_inactive(run, email, session_factory):
+    async def scenario():
+        session = await session_factory()
+        try:
+            tokens, client = await _setup(session, email)
+            await session.container.auth_controller.revoke(tokens["refresh_token"])
+            assert (await _introspect(session, tokens["refresh_token"], client)) == {"active": False}
+        finally:
+            await session.client.shutdown()
+
+    run(scenario())
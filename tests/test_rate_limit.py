@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app.auth import rate_limit
+from app.auth.rate_limit import MongoRateLimitBackend
+from app.models.rate_limit_models import RateLimitCounter
+
+mongomock = pytest.importorskip("mongomock")
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    collection = mongomock.MongoClient().db.rate_limit_counters
+    monkeypatch.setattr(RateLimitCounter, "_get_collection", classmethod(lambda cls: collection))
+    return MongoRateLimitBackend()
+
+
+def test_mongo_backend_counts_in_a_sliding_window(run, backend, monkeypatch):
+    now = [1200.0]
+    monkeypatch.setattr(rate_limit.time, "time", lambda: now[0])
+
+    async def scenario():
+        assert [await backend.incr("k", 60) for _ in range(3)] == [1.0, 2.0, 3.0]
+        # Metade da janela seguinte: a anterior ainda pesa 50%
+        now[0] = 1290.0
+        assert await backend.incr("k", 60) == pytest.approx(3 * 0.5 + 1)
+        # Duas janelas depois nada da contagem antiga sobra
+        now[0] = 1500.0
+        assert await backend.incr("k", 60) == 1.0
+        await backend.reset("k")
+        assert await backend.incr("k", 60) == 1.0
+
+    run(scenario())
+
+
+def test_mongo_backend_locks_until_expiry(run, backend, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "time", lambda: now[0])
+
+    async def scenario():
+        assert await backend.locked_for("lock:username:a") == 0.0
+        await backend.lock("lock:username:a", 30)
+        now[0] = 1010.0
+        assert await backend.locked_for("lock:username:a") == pytest.approx(20)
+        now[0] = 1031.0
+        assert await backend.locked_for("lock:username:a") == 0.0
+
+    run(scenario())
+
+
+def _gunicorn_settings(**env):
+    code = "from app.config import gunicorn_conf as c; print(c.settings.rate_limit_backend)"
+    environment = {key: value for key, value in os.environ.items() if key != "RATE_LIMIT_BACKEND"}
+    environment.update(WEB_WORKERS="2", REVOCATION_STORE_BACKEND="mongo", **env)
+    return subprocess.run([sys.executable, "-c", code], env=environment, capture_output=True, text=True)
+
+
+def test_gunicorn_shares_the_rate_limit_across_workers():
+    result = _gunicorn_settings(RATE_LIMIT_ENABLED="true")
+    assert result.stdout.strip() == "mongo"
+
+    result = _gunicorn_settings(RATE_LIMIT_ENABLED="true", RATE_LIMIT_BACKEND="memory")
+    assert result.returncode != 0
+    assert "RATE_LIMIT_BACKEND=memory" in result.stderr
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+from fastapi import HTTPException
+from pymongo.errors import AutoReconnect
+
+from app.models.token_models import UsedRefreshToken
+from app.repository.revocation_repository import MongoRevocationStore
+
+
+async def _login(session, email):
+    password = await session.register(email)
+    status, body = await session.client.post_form(
+        "/oauth/token", {"grant_type": "password", "username": email, "password": password}
+    )
+    assert status == 200
+    return json.loads(body)
+
+
+def test_refresh_retry_after_failed_lookup_keeps_family(run, email, session_factory, monkeypatch):
+    async def scenario():
+        session = await session_factory()
+        try:
+            tokens = await _login(session, email)
+            controller = session.container.auth_controller
+            repository = controller.member_repository
+            lookup = repository.get_member_auth
+
+            async def failing_lookup(member_email):
+                raise AutoReconnect("connection reset")
+
+            monkeypatch.setattr(repository, "get_member_auth", failing_lookup)
+            with pytest.raises(AutoReconnect):
+                await controller.refresh_token(tokens["refresh_token"])
+            monkeypatch.setattr(repository, "get_member_auth", lookup)
+
+            # O mesmo token continua valendo: a falha não o consumiu nem revogou a família
+            rotated = await controller.refresh_token(tokens["refresh_token"])
+            assert rotated.refresh_token != tokens["refresh_token"]
+            rotated_again = await controller.refresh_token(rotated.refresh_token)
+            assert rotated_again.access_token
+        finally:
+            await session.client.shutdown()
+
+    run(scenario())
+
+
+def test_refresh_token_reuse_revokes_family(run, email, session_factory):
+    async def scenario():
+        session = await session_factory()
+        try:
+            tokens = await _login(session, email)
+            controller = session.container.auth_controller
+            rotated = await controller.refresh_token(tokens["refresh_token"])
+            with pytest.raises(HTTPException) as reused:
+                await controller.refresh_token(tokens["refresh_token"])
+            assert reused.value.status_code == 401
+            with pytest.raises(HTTPException):
+                await controller.refresh_token(rotated.refresh_token)
+        finally:
+            await session.client.shutdown()
+
+    run(scenario())
+
+
+def test_mongo_store_keeps_jti_free_when_insert_fails(run, monkeypatch):
+    def failing_save(self, *args, **kwargs):
+        raise AutoReconnect("connection reset")
+
+    monkeypatch.setattr(UsedRefreshToken, "save", failing_save)
+    store = MongoRevocationStore()
+
+    async def scenario():
+        with pytest.raises(AutoReconnect):
+            await store.mark_used("jti-1", "family-1", 4102444800.0)
+        assert not store.is_used_locally("jti-1")
+
+    run(scenario())